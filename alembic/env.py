@@ -19,6 +19,7 @@ from app.models.project import Project
 from app.models.task import Task
 from app.models.role import Role
 from app.models.time_entry import TimeEntry
+from app.models.time_rollup import TimeRollup
 
 # this is the Alembic Config object
 config = context.config
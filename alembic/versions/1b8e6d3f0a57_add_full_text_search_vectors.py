@@ -0,0 +1,47 @@
+"""Add full-text search vectors to projects, tasks and time entries
+
+Revision ID: 1b8e6d3f0a57
+Revises: 9c4d1a7e5f28
+Create Date: 2026-10-18 17:12:48.093514
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b8e6d3f0a57'
+down_revision = '9c4d1a7e5f28'
+branch_labels = None
+depends_on = None
+
+# Stored generated columns; adding one rewrites the table once
+SEARCH_VECTORS = {
+    'projects': (
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(client_name, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+    ),
+    'tasks': (
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+    ),
+    'time_entries': (
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+    ),
+}
+
+
+def upgrade() -> None:
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table in reversed(list(SEARCH_VECTORS)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
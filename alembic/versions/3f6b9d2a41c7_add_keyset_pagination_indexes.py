@@ -0,0 +1,34 @@
+"""Add keyset pagination indexes
+
+Revision ID: 3f6b9d2a41c7
+Revises: c85db2085dd0
+Create Date: 2026-10-18 11:02:37.512040
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6b9d2a41c7'
+down_revision = 'c85db2085dd0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_projects_user_id_id', 'projects', ['user_id', 'id'], unique=False)
+    op.create_index('ix_projects_user_id_status_id', 'projects', ['user_id', 'status', 'id'], unique=False)
+    op.create_index('ix_tasks_user_id_created_at_id', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_user_id_status_created_at_id', 'tasks', ['user_id', 'status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_user_id_priority_created_at_id', 'tasks', ['user_id', 'priority', 'created_at', 'id'], unique=False)
+    op.create_index('ix_time_entries_task_id_user_id_start_time_id', 'time_entries', ['task_id', 'user_id', 'start_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_entries_task_id_user_id_start_time_id', table_name='time_entries')
+    op.drop_index('ix_tasks_user_id_priority_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_status_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_created_at_id', table_name='tasks')
+    op.drop_index('ix_projects_user_id_status_id', table_name='projects')
+    op.drop_index('ix_projects_user_id_id', table_name='projects')
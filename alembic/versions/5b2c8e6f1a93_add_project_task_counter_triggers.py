@@ -0,0 +1,94 @@
+"""Add project task counter triggers
+
+Revision ID: 5b2c8e6f1a93
+Revises: d41f7b3e9c25
+Create Date: 2026-10-18 13:02:55.417803
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2c8e6f1a93'
+down_revision = 'd41f7b3e9c25'
+branch_labels = None
+depends_on = None
+
+COUNTER_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_project_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+            FROM new_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) - d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) - d.completed
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+            FROM old_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSE
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed
+        FROM (
+            SELECT project_id, sum(total) AS total, sum(completed) AS completed
+            FROM (
+                SELECT project_id, 1 AS total,
+                       CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END AS completed
+                FROM new_rows
+                UNION ALL
+                SELECT project_id, -1,
+                       CASE WHEN status = 'COMPLETED' THEN -1 ELSE 0 END
+                FROM old_rows
+            ) changes
+            WHERE project_id IS NOT NULL
+            GROUP BY project_id
+            HAVING sum(total) <> 0 OR sum(completed) <> 0
+        ) d
+        WHERE p.id = d.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+COUNTER_TRIGGERS = [
+    'CREATE TRIGGER tasks_project_counters_insert AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_project_counters()',
+    'CREATE TRIGGER tasks_project_counters_delete AFTER DELETE ON tasks REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_project_counters()',
+    'CREATE TRIGGER tasks_project_counters_update AFTER UPDATE ON tasks REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_project_counters()',
+]
+
+
+def upgrade() -> None:
+    op.execute(COUNTER_FUNCTION)
+    for statement in COUNTER_TRIGGERS:
+        op.execute(statement)
+    # Start from exact counts; nothing maintained them before
+    op.execute(
+        """
+        UPDATE projects SET
+            total_tasks = (SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id),
+            completed_tasks = (SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id
+                               AND tasks.status = 'COMPLETED')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS tasks_project_counters_update ON tasks')
+    op.execute('DROP TRIGGER IF EXISTS tasks_project_counters_delete ON tasks')
+    op.execute('DROP TRIGGER IF EXISTS tasks_project_counters_insert ON tasks')
+    op.execute('DROP FUNCTION IF EXISTS tasks_project_counters()')
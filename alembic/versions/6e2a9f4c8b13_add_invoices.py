@@ -0,0 +1,64 @@
+"""Add invoices and invoice_line_items tables
+
+Revision ID: 6e2a9f4c8b13
+Revises: 1b8e6d3f0a57
+Create Date: 2026-10-18 18:03:26.551208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2a9f4c8b13'
+down_revision = '1b8e6d3f0a57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    invoice_status = sa.Enum('DRAFT', 'ISSUED', 'PAID', 'VOID', name='invoicestatus')
+    op.create_table(
+        'invoices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('client_name', sa.String(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('status', invoice_status, nullable=False),
+        sa.Column('hourly_rate', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('total_hours', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'client_name', 'period_start', 'period_end',
+                            name='uq_invoices_user_id_client_name_period')
+    )
+    op.create_index(op.f('ix_invoices_id'), 'invoices', ['id'], unique=False)
+    op.create_table(
+        'invoice_line_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('invoice_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('hours', sa.Float(), nullable=False),
+        sa.Column('billed_hours', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('rate', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_invoice_line_items_id'), 'invoice_line_items', ['id'], unique=False)
+    op.create_index(op.f('ix_invoice_line_items_invoice_id'), 'invoice_line_items', ['invoice_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_invoice_line_items_invoice_id'), table_name='invoice_line_items')
+    op.drop_index(op.f('ix_invoice_line_items_id'), table_name='invoice_line_items')
+    op.drop_table('invoice_line_items')
+    op.drop_index(op.f('ix_invoices_id'), table_name='invoices')
+    op.drop_table('invoices')
+    sa.Enum(name='invoicestatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,24 @@
+"""Add time_entries (user_id, start_time) index
+
+Revision ID: 8a1e5c07d2b4
+Revises: 3f6b9d2a41c7
+Create Date: 2026-10-18 11:40:12.208716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a1e5c07d2b4'
+down_revision = '3f6b9d2a41c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_time_entries_user_id_start_time', 'time_entries', ['user_id', 'start_time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_entries_user_id_start_time', table_name='time_entries')
@@ -0,0 +1,65 @@
+"""Add role_version to users, bumped by triggers on user_role
+
+Revision ID: 9c4d1a7e5f28
+Revises: e7a2c4f9b310
+Create Date: 2026-10-18 16:05:12.418350
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4d1a7e5f28'
+down_revision = 'e7a2c4f9b310'
+branch_labels = None
+depends_on = None
+
+ROLE_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION user_role_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE users SET role_version = role_version + 1 WHERE id = OLD.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE users SET role_version = role_version + 1 WHERE id = NEW.user_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+ROLES_RENAME_FUNCTION = """
+CREATE OR REPLACE FUNCTION roles_rename_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE users SET role_version = role_version + 1
+    WHERE id IN (SELECT user_id FROM user_role WHERE role_id = NEW.id);
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('role_version', sa.Integer(), server_default='1', nullable=False))
+    op.execute(ROLE_VERSION_FUNCTION)
+    op.execute(ROLES_RENAME_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER user_role_version AFTER INSERT OR UPDATE OR DELETE ON user_role "
+        "FOR EACH ROW EXECUTE FUNCTION user_role_version()"
+    )
+    op.execute(
+        "CREATE TRIGGER roles_rename_version AFTER UPDATE OF name ON roles "
+        "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name) "
+        "EXECUTE FUNCTION roles_rename_version()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS roles_rename_version ON roles")
+    op.execute("DROP TRIGGER IF EXISTS user_role_version ON user_role")
+    op.execute("DROP FUNCTION IF EXISTS roles_rename_version()")
+    op.execute("DROP FUNCTION IF EXISTS user_role_version()")
+    op.drop_column('users', 'role_version')
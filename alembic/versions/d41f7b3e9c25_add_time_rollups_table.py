@@ -0,0 +1,58 @@
+"""Add time_rollups table
+
+Revision ID: d41f7b3e9c25
+Revises: 8a1e5c07d2b4
+Create Date: 2026-10-18 12:15:48.930127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f7b3e9c25'
+down_revision = '8a1e5c07d2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'time_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('total_hours', sa.Float(), nullable=False),
+        sa.Column('billable_hours', sa.Float(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('billable_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'task_id', 'day')
+    )
+    op.create_index('ix_time_rollups_user_id_day', 'time_rollups', ['user_id', 'day'], unique=False)
+    op.create_index('ix_time_rollups_project_id_day', 'time_rollups', ['project_id', 'day'], unique=False)
+    # Populate from existing history; large installs can instead run
+    # `python -m app.cli rebuild-rollups` in chunks after migrating.
+    op.execute(
+        """
+        INSERT INTO time_rollups (user_id, task_id, day, project_id, total_hours,
+                                  billable_hours, entry_count, billable_count)
+        SELECT te.user_id, te.task_id, date(te.start_time), max(t.project_id),
+               coalesce(sum(te.duration), 0),
+               coalesce(sum(te.duration) FILTER (WHERE te.is_billable), 0),
+               count(te.id),
+               count(te.id) FILTER (WHERE te.is_billable)
+        FROM time_entries te JOIN tasks t ON t.id = te.task_id
+        WHERE te.user_id IS NOT NULL AND te.start_time IS NOT NULL
+        GROUP BY te.user_id, te.task_id, date(te.start_time)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_rollups_project_id_day', table_name='time_rollups')
+    op.drop_index('ix_time_rollups_user_id_day', table_name='time_rollups')
+    op.drop_table('time_rollups')
@@ -0,0 +1,138 @@
+"""Add version columns to projects and tasks
+
+Revision ID: e7a2c4f9b310
+Revises: 5b2c8e6f1a93
+Create Date: 2026-10-18 14:21:37.902164
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2c4f9b310'
+down_revision = '5b2c8e6f1a93'
+branch_labels = None
+depends_on = None
+
+# The counter trigger function, now also bumping the project's version
+COUNTER_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_project_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed,
+            version = p.version + 1,
+            updated_at = (now() AT TIME ZONE 'UTC')
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+            FROM new_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) - d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) - d.completed,
+            version = p.version + 1,
+            updated_at = (now() AT TIME ZONE 'UTC')
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+            FROM old_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSE
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed,
+            version = p.version + 1,
+            updated_at = (now() AT TIME ZONE 'UTC')
+        FROM (
+            SELECT project_id, sum(total) AS total, sum(completed) AS completed
+            FROM (
+                SELECT project_id, 1 AS total,
+                       CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END AS completed
+                FROM new_rows
+                UNION ALL
+                SELECT project_id, -1,
+                       CASE WHEN status = 'COMPLETED' THEN -1 ELSE 0 END
+                FROM old_rows
+            ) changes
+            WHERE project_id IS NOT NULL
+            GROUP BY project_id
+            HAVING sum(total) <> 0 OR sum(completed) <> 0
+        ) d
+        WHERE p.id = d.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+PREVIOUS_COUNTER_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_project_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+            FROM new_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) - d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) - d.completed
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+            FROM old_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSE
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed
+        FROM (
+            SELECT project_id, sum(total) AS total, sum(completed) AS completed
+            FROM (
+                SELECT project_id, 1 AS total,
+                       CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END AS completed
+                FROM new_rows
+                UNION ALL
+                SELECT project_id, -1,
+                       CASE WHEN status = 'COMPLETED' THEN -1 ELSE 0 END
+                FROM old_rows
+            ) changes
+            WHERE project_id IS NOT NULL
+            GROUP BY project_id
+            HAVING sum(total) <> 0 OR sum(completed) <> 0
+        ) d
+        WHERE p.id = d.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('projects', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.execute("UPDATE projects SET updated_at = now() AT TIME ZONE 'UTC'")
+    op.execute(COUNTER_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_COUNTER_FUNCTION)
+    op.drop_column('tasks', 'version')
+    op.drop_column('projects', 'updated_at')
+    op.drop_column('projects', 'version')
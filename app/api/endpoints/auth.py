@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.core import security
 from app.core.config import settings
-from app.db.base import get_db
+from app.core.dependencies import invalidate_user_principals
+from app.core.hashing import password_hasher
+from app.core.permissions import role_claims
+from app.core.ratelimit import auth_rate_limiter
+from app.db.base import get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, Token, LoginRequest
 from datetime import timedelta, datetime
@@ -18,74 +25,97 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    logger.info("=== Login Process Started ===")
-    logger.info(f"Login attempt for email: {login_data.email}")
-    
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not security.verify_password(login_data.password, user.hashed_password):
-        logger.error(f"Login failed for email: {login_data.email}")
+    # Throttle before any database or bcrypt work. Only failed attempts
+    # are charged to the email, so normal logins never use it up.
+    await auth_rate_limiter.check_ip(request)
+    await auth_rate_limiter.check_email(login_data.email, cost=0)
+
+    # Roles are resolved here, once, and travel in the token from now on
+    result = await db.execute(
+        select(User).options(selectinload(User.roles)).where(User.email == login_data.email)
+    )
+    user = result.scalar_one_or_none()
+    if not user or not await password_hasher.verify(login_data.password, user.hashed_password):
+        logger.debug("Login failed for %s", login_data.email)
+        await auth_rate_limiter.charge_email(login_data.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    logger.info("Password verification successful")
+    if password_hasher.needs_rehash(user.hashed_password):
+        # The configured bcrypt cost changed; upgrade the stored hash now
+        # that we have the plain password.
+        user.hashed_password = await password_hasher.rehash(login_data.password)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        data={"sub": login_data.email}, expires_delta=access_token_expires
+        data={
+            "sub": login_data.email,
+            **role_claims([role.name for role in user.roles], user.role_version),
+        },
+        expires_delta=access_token_expires
     )
-    logger.info(f"Generated new access token: {access_token[:10]}...")
     
     # Обновляем токен в базе данных
-    logger.info("Updating token in database...")
     user.access_token = access_token
     user.token_expires = datetime.utcnow() + access_token_expires
     user.last_login = datetime.utcnow()
     
+    user_id = user.id
     try:
-        db.commit()
-        logger.info("Token successfully saved to database")
-    except Exception as e:
-        logger.error(f"Error saving token to database: {str(e)}")
-        db.rollback()
+        await db.commit()
+        invalidate_user_principals(user_id)
+    except Exception:
+        logger.exception("Error saving token for user %s", user_id)
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error saving authentication data"
         )
     
-    logger.info("=== Login Process Completed ===")
+    logger.debug("User %s logged in", user_id)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=Token)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_user = db.query(User).filter(User.email == user_data.email).first()
-    if db_user:
+    await auth_rate_limiter.check_ip(request)
+    await auth_rate_limiter.check_email(user_data.email)
+    # An index-only lookup, so a duplicate never pays for a bcrypt hash
+    existing = await db.scalar(select(User.id).where(User.email == user_data.email))
+    if existing is not None:
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    hashed_password = security.get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    # A new account has no roles and the initial role version
     access_token = security.create_access_token(
-        data={"sub": user_data.email}, expires_delta=access_token_expires
+        data={"sub": user_data.email, **role_claims([], 1)},
+        expires_delta=access_token_expires
     )
     
-    db_user = User(
-        username=user_data.email,
-        email=user_data.email,
-        hashed_password=hashed_password,
-        first_name=user_data.first_name,
-        last_name=user_data.last_name,
-        access_token=access_token,
-        token_expires=datetime.utcnow() + access_token_expires,
-        registration_date=datetime.utcnow()
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    # A concurrent registration can still win the race; the unique email
+    # index rejects the second insert
+    try:
+        await db.execute(insert(User).values(
+            username=user_data.email,
+            email=user_data.email,
+            hashed_password=hashed_password,
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            access_token=access_token,
+            token_expires=datetime.utcnow() + access_token_expires,
+            registration_date=datetime.utcnow()
+        ))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.dependencies import get_current_active_user
+from app.db.base import get_async_db
+from app.schemas.dashboard import Dashboard
+from app.services.dashboard import get_dashboard
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+@router.get("", response_model=Dashboard)
+async def read_dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Projects with progress, upcoming tasks and this week's hours and billable value."""
+    return await get_dashboard(db, current_user)
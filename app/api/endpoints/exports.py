@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from typing import Optional
+from datetime import datetime
+from app.core.dependencies import get_current_active_user
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.models.time_entry import TimeEntry
+from app.schemas.time_entry import BulkFormat
+from app.services.export import MEDIA_TYPES, stream_query
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+TIME_ENTRY_COLUMNS = [
+    TimeEntry.id,
+    TimeEntry.task_id,
+    Task.project_id,
+    TimeEntry.start_time,
+    TimeEntry.end_time,
+    TimeEntry.duration,
+    TimeEntry.description,
+    TimeEntry.is_billable,
+]
+
+TASK_COLUMNS = [
+    Task.id,
+    Task.project_id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.created_at,
+    Task.updated_at,
+    Task.due_time,
+    Task.estimated_hours,
+]
+
+def _export_response(query, columns, format: BulkFormat, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_query(query, [column.key for column in columns], format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{format.value}"'
+        },
+    )
+
+@router.get("/time-entries")
+async def export_time_entries(
+    format: BulkFormat = BulkFormat.NDJSON,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    project_id: Optional[int] = None,
+    is_billable: Optional[bool] = None,
+    current_user = Depends(get_current_active_user)
+):
+    query = select(*TIME_ENTRY_COLUMNS).join(
+        Task, Task.id == TimeEntry.task_id
+    ).where(TimeEntry.user_id == current_user.id)
+    if start_date is not None:
+        query = query.where(TimeEntry.start_time >= start_date)
+    if end_date is not None:
+        query = query.where(TimeEntry.start_time < end_date)
+    if project_id is not None:
+        query = query.where(Task.project_id == project_id)
+    if is_billable is not None:
+        query = query.where(TimeEntry.is_billable == is_billable)
+    query = query.order_by(TimeEntry.start_time, TimeEntry.id)
+    return _export_response(query, TIME_ENTRY_COLUMNS, format, "time-entries")
+
+@router.get("/tasks")
+async def export_tasks(
+    format: BulkFormat = BulkFormat.NDJSON,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    project_id: Optional[int] = None,
+    current_user = Depends(get_current_active_user)
+):
+    query = select(*TASK_COLUMNS).where(Task.user_id == current_user.id)
+    if status is not None:
+        query = query.where(Task.status == status)
+    if priority is not None:
+        query = query.where(Task.priority == priority)
+    if project_id is not None:
+        query = query.where(Task.project_id == project_id)
+    query = query.order_by(Task.created_at, Task.id)
+    return _export_response(query, TASK_COLUMNS, format, "tasks")
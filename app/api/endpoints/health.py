@@ -0,0 +1,45 @@
+import asyncio
+import logging
+import time
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.replicas import replica_set
+from app.db.session import async_engine
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+async def _ping_database() -> float:
+    started = time.perf_counter()
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return time.perf_counter() - started
+
+@router.get("/live", include_in_schema=False)
+async def liveness():
+    """The process serves requests; deliberately independent of the database."""
+    return {"status": "alive"}
+
+@router.get("/ready", include_in_schema=False)
+async def readiness(request: Request):
+    """Ready when a pooled connection can be checked out and answer in time.
+
+    An exhausted pool fails this too, since checkout waits past the timeout.
+    Replicas are reported but never fail it: reads fall back to the primary.
+    """
+    startup = getattr(request.app.state, "startup", None)
+    try:
+        seconds = await asyncio.wait_for(_ping_database(), settings.HEALTH_DB_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.warning("Readiness check failed: %r", e)
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": "unreachable"},
+        )
+    data = {"status": "ready", "database_seconds": round(seconds, 4), "startup": startup}
+    if replica_set.replicas:
+        data["replicas"] = replica_set.snapshot()
+    return data
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends
+from app.core.config import settings
+from app.core.dependencies import require_permission
+from app.core.hashing import password_hasher
+from app.core.metrics import metrics
+from app.core.ratelimit import auth_rate_limiter
+from app.core.result_cache import result_cache
+from app.db import pool as pool_telemetry
+from app.db.replicas import replica_set
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+@router.get("/pool")
+async def read_pool_statistics(
+    current_user = Depends(require_permission("internal:read"))
+):
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+            "application_name": settings.DB_APPLICATION_NAME,
+        },
+        "engines": {
+            name: telemetry.snapshot()
+            for name, telemetry in pool_telemetry.registry.items()
+        },
+        "password_hasher": password_hasher.snapshot(),
+        "auth_rate_limiter": auth_rate_limiter.snapshot(),
+        "replicas": replica_set.snapshot(),
+        "result_cache": result_cache.snapshot(),
+    }
+
+
+@router.get("/queries")
+async def read_query_samples(
+    current_user = Depends(require_permission("internal:read"))
+):
+    """Recent slow statements and suspected N+1 patterns, with their routes."""
+    return metrics.samples()
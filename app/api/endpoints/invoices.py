@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+from datetime import datetime
+from app.core.dependencies import get_current_active_user, require_permission
+from app.core.pagination import keyset_page, finish_page
+from app.db.base import get_async_db
+from app.db.writes import update_returning
+from app.models.invoice import Invoice, InvoiceStatus
+from app.schemas.invoice import (
+    Invoice as InvoiceSchema,
+    InvoiceBatchResult,
+    InvoiceCreate,
+    InvoicePreview,
+    InvoiceSummary,
+)
+from app.services.invoicing import generate_invoices, month_period, preview_invoices, previous_month
+
+router = APIRouter(prefix="/invoices", tags=["invoices"])
+
+@router.get("/preview", response_model=List[InvoicePreview])
+async def preview_my_invoices(
+    period_start: datetime,
+    period_end: datetime,
+    client_name: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Billable totals per client and project for a period, without saving anything."""
+    if period_end <= period_start:
+        raise HTTPException(status_code=400, detail="period_end must be after period_start")
+    return await preview_invoices(
+        db, period_start, period_end, user_id=current_user.id, client_name=client_name
+    )
+
+@router.post("", response_model=InvoiceSchema)
+async def create_invoice(
+    invoice_create: InvoiceCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    try:
+        result = await generate_invoices(
+            db,
+            invoice_create.period_start,
+            invoice_create.period_end,
+            user_id=current_user.id,
+            client_name=invoice_create.client_name
+        )
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request invoiced the same client and period
+        await db.rollback()
+        result = {"created": 0, "skipped": 1}
+    if result["skipped"]:
+        raise HTTPException(status_code=409, detail="Client already invoiced for this period")
+    if not result["created"]:
+        raise HTTPException(status_code=400, detail="No billable time for this client and period")
+
+    return await db.scalar(
+        select(Invoice).options(selectinload(Invoice.line_items))
+        .where(Invoice.id == result["ids"][0])
+    )
+
+@router.post("/month-end", response_model=InvoiceBatchResult)
+async def generate_month_end_invoices(
+    year: Optional[int] = Query(None, ge=2000, le=9999),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_permission("invoices:batch"))
+):
+    """Invoice every client of every user for a month, the previous one by default."""
+    if (year is None) != (month is None):
+        raise HTTPException(status_code=400, detail="Give both year and month, or neither")
+    if year is None:
+        year, month = previous_month(datetime.utcnow())
+    period_start, period_end = month_period(year, month)
+    result = await generate_invoices(db, period_start, period_end)
+    await db.commit()
+    return result
+
+@router.get("/my", response_model=List[InvoiceSummary])
+async def read_my_invoices(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    client_name: Optional[str] = None,
+    status: Optional[InvoiceStatus] = None,
+    limit: int = Query(100, ge=1, le=500)
+):
+    query = select(Invoice).where(Invoice.user_id == current_user.id)
+    if client_name is not None:
+        query = query.where(Invoice.client_name == client_name)
+    if status is not None:
+        query = query.where(Invoice.status == status)
+    order_by = [Invoice.id]
+    result = await db.execute(keyset_page(query, order_by, cursor, limit))
+    return finish_page(result.scalars().all(), order_by, limit, response)
+
+@router.get("/{invoice_id}", response_model=InvoiceSchema)
+async def read_invoice(
+    invoice_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    # Line items are a snapshot; no time entries are read here
+    invoice = await db.scalar(
+        select(Invoice).options(selectinload(Invoice.line_items)).where(
+            Invoice.id == invoice_id,
+            Invoice.user_id == current_user.id
+        )
+    )
+    if invoice is None:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return invoice
+
+@router.put("/{invoice_id}/status/{status}", response_model=InvoiceSummary)
+async def update_invoice_status(
+    invoice_id: int,
+    status: InvoiceStatus,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    invoice = await update_returning(
+        db, Invoice, {"status": status},
+        Invoice.id == invoice_id,
+        Invoice.user_id == current_user.id
+    )
+    if invoice is None:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    await db.commit()
+    return invoice
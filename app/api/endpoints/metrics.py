@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics
+from app.core.result_cache import result_cache
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    return PlainTextResponse(
+        metrics.render() + result_cache.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,95 +1,155 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.base import get_db
-from app.models.project import Project
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.conditional import check_conditional, collection_etag, make_etag
+from app.core.pagination import keyset_page, finish_page
+from app.core.result_cache import (
+    PROJECTS,
+    TASKS,
+    TIME_ENTRIES,
+    cache_entry,
+    invalidate_results,
+    replay,
+    result_cache,
+    result_key,
+    user_tags,
+)
+from app.core.serialization import encode_page, schema_columns
+from app.db.base import get_async_db
+from app.db.writes import insert_returning, update_returning
+from app.models.project import Project, ProjectStatus
 from app.schemas.project import ProjectCreate, Project as ProjectSchema, ProjectUpdate
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
+from app.services import rollups
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+PROJECT_COLUMNS = schema_columns(Project, ProjectSchema)
+
 @router.post("", response_model=ProjectSchema)
 async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    logger.info(f"Creating new project for user: {current_user.email}")
-    db_project = Project(
-        **project.dict(),
-        user_id=current_user.id
+    logger.debug("Creating project for user %s", current_user.id)
+    db_project = await insert_returning(
+        db, Project, dict(project.dict(), user_id=current_user.id)
     )
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await invalidate_results(current_user.id, PROJECTS)
     return db_project
 
 @router.get("/my", response_model=List[ProjectSchema])
 async def read_my_projects(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    cursor: Optional[str] = None,
+    status: Optional[ProjectStatus] = None,
+    skip: int = Query(0, ge=0, description="Deprecated, use cursor"),
+    limit: int = Query(100, ge=1, le=500)
 ):
-    logger.info(f"Fetching projects for user: {current_user.email}")
-    projects = db.query(Project).filter(
-        Project.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    logger.info(f"Found {len(projects)} projects")
-    return projects
+    criteria = [Project.user_id == current_user.id]
+    if status is not None:
+        criteria.append(Project.status == status)
+
+    # The version query settles a 304 before any page is read or cached
+    etag = await collection_etag(db, Project, criteria, request)
+    not_modified = check_conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    async def build_page():
+        query = select(*PROJECT_COLUMNS).where(*criteria)
+        if skip and not cursor:
+            query = query.offset(skip)
+        order_by = [Project.id]
+        result = await db.execute(keyset_page(query, order_by, cursor, limit))
+        projects = finish_page(result.all(), order_by, limit, response)
+        logger.debug("Found %d projects for user %s", len(projects), current_user.id)
+        return cache_entry(encode_page(projects, PROJECT_COLUMNS, ProjectSchema), etag, headers=response.headers)
+
+    # Keyed by ETag: a page cached before a write this process was not
+    # told about is never served once the version query sees the write
+    entry = await result_cache.get_or_compute(
+        result_key("projects:my", current_user.id, request, version=etag),
+        user_tags(current_user.id, PROJECTS),
+        build_page
+    )
+    return replay(request, entry)
 
 @router.get("/{project_id}", response_model=ProjectSchema)
 async def read_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
-    if project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    async def build_project():
+        result = await db.execute(
+            select(Project).where(
+                Project.id == project_id,
+                Project.user_id == current_user.id
+            )
+        )
+        project = result.scalar_one_or_none()
+        if project is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return cache_entry(
+            ProjectSchema.model_validate(project).model_dump_json().encode(),
+            make_etag(project.id, project.version, project.updated_at),
+            project.updated_at
+        )
+
+    entry = await result_cache.get_or_compute(
+        result_key(f"projects:{project_id}", current_user.id),
+        user_tags(current_user.id, PROJECTS),
+        build_project
+    )
+    return replay(request, entry)
 
 @router.put("/{project_id}", response_model=ProjectSchema)
 async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(
+    project = await update_returning(
+        db, Project, project_update.dict(exclude_unset=True),
         Project.id == project_id,
         Project.user_id == current_user.id
-    ).first()
+    )
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    update_data = project_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(project, field, value)
-    
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await invalidate_results(current_user.id, PROJECTS)
     return project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Project).where(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        )
+    )
+    project = result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await rollups.drop_project_rollups(db, project_id)
+    await db.commit()
+    await invalidate_results(current_user.id, PROJECTS, TASKS, TIME_ENTRIES)
     return None 
\ No newline at end of file
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.dependencies import get_current_active_user
+from app.db.base import get_async_db
+from app.schemas.search import SearchHit, SearchKind
+from app.services.search import search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("", response_model=List[SearchHit])
+async def search_my_work(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for"),
+    kind: Optional[List[SearchKind]] = Query(None, description="Restrict to these kinds"),
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Ranked keyword search over the caller's projects, tasks and time entries."""
+    return await search(db, current_user.id, q, kinds=kind, skip=skip, limit=limit)
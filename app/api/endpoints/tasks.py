@@ -1,108 +1,279 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.base import get_db
-from app.models.task import Task, TaskStatus
-from app.schemas.task import TaskCreate, Task as TaskSchema, TaskUpdate
-from app.core.dependencies import get_current_active_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from app.core.conditional import check_conditional, collection_etag, make_etag
+from app.core.pagination import keyset_page, finish_page
+from app.core.result_cache import (
+    PROJECTS,
+    TASKS,
+    TIME_ENTRIES,
+    cache_entry,
+    invalidate_results,
+    replay,
+    result_cache,
+    result_key,
+    user_tags,
+)
+from app.core.serialization import encode_page, schema_columns
+from app.db.base import get_async_db
+from app.db.writes import insert_returning, update_returning
+from app.models.project import Project
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.models.time_entry import TimeEntry
+from app.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskSelection,
+    Task as TaskSchema,
+    TaskUpdate,
+)
+from app.core.dependencies import get_current_active_user, get_read_db
+from app.services import rollups
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+TASK_COLUMNS = schema_columns(Task, TaskSchema)
+
+def _task_criteria(
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    project_id: Optional[int] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None
+) -> list:
+    criteria = [Task.user_id == user_id]
+    if status is not None:
+        criteria.append(Task.status == status)
+    if priority is not None:
+        criteria.append(Task.priority == priority)
+    if project_id is not None:
+        criteria.append(Task.project_id == project_id)
+    if due_from is not None:
+        criteria.append(Task.due_time >= due_from)
+    if due_to is not None:
+        criteria.append(Task.due_time < due_to)
+    return criteria
+
+def _selection_criteria(selection: TaskSelection, user_id: int) -> list:
+    if selection.ids is not None:
+        return [Task.user_id == user_id, Task.id.in_(selection.ids)]
+    return _task_criteria(user_id, **selection.filter.dict())
+
+def _bulk_result(ids: list, selection: Optional[TaskSelection] = None) -> dict:
+    not_found = []
+    if selection is not None and selection.ids is not None:
+        not_found = sorted(set(selection.ids) - set(ids))
+    return {"count": len(ids), "ids": sorted(ids), "not_found": not_found}
+
 @router.post("", response_model=TaskSchema)
 async def create_task(
     task_create: TaskCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
-    task = Task(
-        **task_create.dict(),
-        user_id=current_user.id
+    task = await insert_returning(
+        db, Task, dict(task_create.dict(), user_id=current_user.id),
+        guard=select(Project.id).where(
+            Project.id == task_create.project_id,
+            Project.user_id == current_user.id
+        ).exists()
     )
-    db.add(task)
-    db.commit()
-    db.refresh(task)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    await db.commit()
+    await invalidate_results(current_user.id, TASKS, PROJECTS)
     return task
 
 @router.get("/my-tasks", response_model=List[TaskSchema])
 async def read_my_tasks(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_active_user),
-    skip: int = 0,
-    limit: int = 100
+    cursor: Optional[str] = None,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    project_id: Optional[int] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    skip: int = Query(0, ge=0, description="Deprecated, use cursor"),
+    limit: int = Query(100, ge=1, le=500)
 ):
-    tasks = db.query(Task).filter(
-        Task.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return tasks
+    criteria = _task_criteria(current_user.id, status, priority, project_id, due_from, due_to)
+
+    etag = await collection_etag(db, Task, criteria, request)
+    not_modified = check_conditional(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    async def build_page():
+        query = select(*TASK_COLUMNS).where(*criteria)
+        if skip and not cursor:
+            query = query.offset(skip)
+        order_by = [Task.created_at, Task.id]
+        result = await db.execute(keyset_page(query, order_by, cursor, limit))
+        tasks = finish_page(result.all(), order_by, limit, response)
+        return cache_entry(encode_page(tasks, TASK_COLUMNS, TaskSchema), etag, headers=response.headers)
+
+    entry = await result_cache.get_or_compute(
+        result_key("tasks:my", current_user.id, request, version=etag),
+        user_tags(current_user.id, TASKS),
+        build_page
+    )
+    return replay(request, entry)
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_create_tasks(
+    bulk: TaskBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    project_id = await db.scalar(
+        select(Project.id).where(
+            Project.id == bulk.project_id,
+            Project.user_id == current_user.id
+        )
+    )
+    if project_id is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # One multi-row INSERT; the counter triggers update the project once
+    result = await db.execute(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True),
+        [dict(task.dict(), project_id=project_id, user_id=current_user.id) for task in bulk.tasks]
+    )
+    ids = result.scalars().all()
+    await db.commit()
+    await invalidate_results(current_user.id, TASKS, PROJECTS)
+    return _bulk_result(ids)
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    bulk: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Set the status and/or priority of the selected tasks in one UPDATE."""
+    values = bulk.dict(include={"status", "priority"}, exclude_none=True)
+    result = await db.execute(
+        update(Task)
+        .where(*_selection_criteria(bulk, current_user.id))
+        .values(**values)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    ids = result.scalars().all()
+    await db.commit()
+    await invalidate_results(current_user.id, TASKS, PROJECTS)
+    return _bulk_result(ids, bulk)
+
+@router.post("/bulk/delete", response_model=TaskBulkResult)
+async def bulk_delete_tasks(
+    selection: TaskSelection,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Delete the selected tasks with their time entries and rollups."""
+    criteria = _selection_criteria(selection, current_user.id)
+    selected = select(Task.id).where(*criteria)
+    await db.execute(delete(TimeEntry).where(TimeEntry.task_id.in_(selected)))
+    await rollups.drop_tasks_rollups(db, selected)
+    result = await db.execute(
+        delete(Task)
+        .where(*criteria)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    ids = result.scalars().all()
+    await db.commit()
+    await invalidate_results(current_user.id, TASKS, PROJECTS, TIME_ENTRIES)
+    return _bulk_result(ids, selection)
 
 @router.get("/{task_id}", response_model=TaskSchema)
 async def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Task).where(
+            Task.id == task_id,
+            Task.user_id == current_user.id
+        )
+    )
+    task = result.scalar_one_or_none()
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+    not_modified = check_conditional(
+        request, response,
+        make_etag(task.id, task.version, task.updated_at),
+        task.updated_at
+    )
+    if not_modified is not None:
+        return not_modified
     return task
 
 @router.put("/{task_id}/status/{status}", response_model=TaskSchema)
 async def update_task_status(
     task_id: int,
     status: TaskStatus,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
-    task = db.query(Task).filter(
+    task = await update_returning(
+        db, Task, {"status": status},
         Task.id == task_id,
         Task.user_id == current_user.id
-    ).first()
+    )
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    task.status = status
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await invalidate_results(current_user.id, TASKS, PROJECTS)
     return task
 
 @router.put("/{task_id}", response_model=TaskSchema)
 async def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
-    task = db.query(Task).filter(
+    task = await update_returning(
+        db, Task, task_update.dict(exclude_unset=True),
         Task.id == task_id,
         Task.user_id == current_user.id
-    ).first()
+    )
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    update_data = task_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
-    
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await invalidate_results(current_user.id, TASKS, PROJECTS)
     return task
 
 @router.delete("/{task_id}", response_model=TaskSchema)
 async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(Task).where(
+            Task.id == task_id,
+            Task.user_id == current_user.id
+        )
+    )
+    task = result.scalar_one_or_none()
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await rollups.drop_task_rollups(db, task_id)
+    await db.commit()
+    await invalidate_results(current_user.id, TASKS, PROJECTS, TIME_ENTRIES)
     return task 
\ No newline at end of file
@@ -1,90 +1,183 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime
-from app.db.base import get_db
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.core.config import settings
+from app.core.pagination import keyset_page, finish_page
+from app.core.result_cache import TIME_ENTRIES, invalidate_results
+from app.core.serialization import list_response, schema_columns
+from app.db.base import get_async_db
+from app.db.writes import insert_returning
+from app.models.task import Task
 from app.models.time_entry import TimeEntry
-from app.schemas.time_entry import TimeEntryCreate, TimeEntry as TimeEntrySchema
-from app.core.dependencies import get_current_active_user
+from app.schemas.time_entry import (
+    BulkFormat,
+    TimeEntryBulkResult,
+    TimeEntryCreate,
+    TimeEntry as TimeEntrySchema,
+    TimeGrouping,
+    TimeStatistics,
+)
+from app.core.dependencies import get_current_active_user, get_read_db, has_permission
+from app.services import rollups
+from app.services.ingest import TimeEntryIngester, iter_lines, iter_records
+from app.services.time_stats import compute_time_statistics
 
 router = APIRouter(tags=["time-entries"])
 
+TIME_ENTRY_COLUMNS = schema_columns(TimeEntry, TimeEntrySchema)
+
 @router.post("/tasks/{task_id}/time", response_model=TimeEntrySchema)
 async def create_time_entry(
     task_id: int,
     time_entry: TimeEntryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
-    db_time_entry = TimeEntry(
-        **time_entry.dict(),
-        task_id=task_id,
-        user_id=current_user.id
+    db_time_entry = await insert_returning(
+        db, TimeEntry, dict(time_entry.dict(), task_id=task_id, user_id=current_user.id),
+        guard=select(Task.id).where(
+            Task.id == task_id,
+            Task.user_id == current_user.id
+        ).exists()
     )
-    db.add(db_time_entry)
-    db.commit()
-    db.refresh(db_time_entry)
+    if db_time_entry is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    await rollups.add_stored_to_rollups(db, db_time_entry.id, db_time_entry.id)
+    await db.commit()
+    await invalidate_results(current_user.id, TIME_ENTRIES)
     return db_time_entry
 
+@router.post(
+    "/time-entries/bulk",
+    response_model=TimeEntryBulkResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def bulk_create_time_entries(
+    request: Request,
+    format: Optional[BulkFormat] = Query(
+        None, description="Defaults to csv for text/csv bodies, ndjson otherwise"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Import time entries from an NDJSON or CSV body.
+
+    Every record carries ``task_id`` plus the TimeEntryCreate fields. Valid
+    rows are written in one transaction; invalid rows are reported by
+    their 1-based record number.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = BulkFormat.CSV if content_type.startswith("text/csv") else BulkFormat.NDJSON
+
+    ingester = TimeEntryIngester(
+        db,
+        current_user.id,
+        chunk_size=settings.BULK_INSERT_CHUNK_SIZE,
+        max_errors=settings.BULK_MAX_REPORTED_ERRORS
+    )
+    try:
+        async for row_number, data, error in iter_records(iter_lines(request.stream()), format):
+            await ingester.add(row_number, data, error)
+        await ingester.flush()
+    except UnicodeDecodeError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Request body must be UTF-8")
+    await db.commit()
+    await invalidate_results(current_user.id, TIME_ENTRIES)
+    return ingester.result()
+
 @router.get("/tasks/{task_id}/time", response_model=List[TimeEntrySchema])
 async def read_task_time_entries(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    is_billable: Optional[bool] = None,
+    limit: int = Query(100, ge=1, le=500)
 ):
-    time_entries = db.query(TimeEntry).filter(
+    query = select(*TIME_ENTRY_COLUMNS).where(
         TimeEntry.task_id == task_id,
         TimeEntry.user_id == current_user.id
-    ).all()
-    return time_entries
+    )
+    if start_from is not None:
+        query = query.where(TimeEntry.start_time >= start_from)
+    if start_to is not None:
+        query = query.where(TimeEntry.start_time < start_to)
+    if is_billable is not None:
+        query = query.where(TimeEntry.is_billable == is_billable)
+    order_by = [TimeEntry.start_time, TimeEntry.id]
+    result = await db.execute(keyset_page(query, order_by, cursor, limit))
+    entries = finish_page(result.all(), order_by, limit, response)
+    return list_response(entries, TIME_ENTRY_COLUMNS, response)
 
 @router.delete("/tasks/{task_id}/time/{time_entry_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_time_entry(
     task_id: int,
     time_entry_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_active_user)
 ):
-    time_entry = db.query(TimeEntry).filter(
-        TimeEntry.id == time_entry_id,
-        TimeEntry.task_id == task_id,
-        TimeEntry.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(TimeEntry).where(
+            TimeEntry.id == time_entry_id,
+            TimeEntry.task_id == task_id,
+            TimeEntry.user_id == current_user.id
+        )
+    )
+    time_entry = result.scalar_one_or_none()
     if time_entry is None:
         raise HTTPException(status_code=404, detail="Time entry not found")
     
-    db.delete(time_entry)
-    db.commit()
+    await db.delete(time_entry)
+    await rollups.remove_from_rollups(db, [rollups.entry_values(time_entry, None)])
+    await db.commit()
+    await invalidate_results(current_user.id, TIME_ENTRIES)
     return {"ok": True}
 
-@router.get("/users/{user_id}/time-statistics")
+@router.get(
+    "/users/{user_id}/time-statistics",
+    response_model=TimeStatistics,
+    response_model_exclude_none=True
+)
 async def get_user_time_statistics(
     user_id: int,
     start_date: datetime = None,
     end_date: datetime = None,
-    db: Session = Depends(get_db),
+    group_by: Optional[TimeGrouping] = None,
+    tz: str = Query("UTC", description="IANA time zone for day/week/month buckets"),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_active_user)
 ):
-    if current_user.id != user_id and not current_user.is_admin:
+    if current_user.id != user_id and not has_permission(current_user, "time_statistics:read_any"):
         raise HTTPException(
             status_code=403,
             detail="Not authorized to view other user's time statistics"
         )
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail="Unknown time zone")
     
-    query = db.query(TimeEntry).filter(TimeEntry.user_id == user_id)
-    
-    if start_date:
-        query = query.filter(TimeEntry.start_time >= start_date)
-    if end_date:
-        query = query.filter(TimeEntry.end_time <= end_date)
-    
-    time_entries = query.all()
-    
-    total_time = sum(entry.duration for entry in time_entries)
-    billable_time = sum(entry.duration for entry in time_entries if entry.is_billable)
-    
-    return {
-        "total_time": total_time,
-        "billable_time": billable_time,
-        "number_of_entries": len(time_entries)
-    } 
\ No newline at end of file
+    return await compute_time_statistics(
+        db,
+        user_id,
+        start_date=start_date,
+        end_date=end_date,
+        group_by=group_by,
+        tz=tz
+    )
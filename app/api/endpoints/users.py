@@ -1,11 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.core import security
-from app.db.base import get_db
+from app.core.hashing import password_hasher
+from app.core.result_cache import ALL_RESOURCES, PROFILE, invalidate_results
+from app.services import rollups
+from app.db.base import get_async_db
+from app.db.writes import update_returning
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, UserUpdate
-from app.core.dependencies import get_current_user, get_current_active_user, get_current_admin_user
+from app.core.dependencies import (
+    get_current_user,
+    get_current_active_user,
+    invalidate_user_principals,
+    require_permission,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -18,10 +27,11 @@ async def read_user_me(
 @router.get("/{user_id}", response_model=UserSchema)
 async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission("users:read"))
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -30,35 +40,36 @@ async def read_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission("users:write"))
 ):
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if db_user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     update_data = user_update.dict(exclude_unset=True)
     if "password" in update_data:
-        update_data["hashed_password"] = security.get_password_hash(update_data["password"])
+        update_data["hashed_password"] = await password_hasher.hash(update_data["password"])
         del update_data["password"]
     
-    for field, value in update_data.items():
-        setattr(db_user, field, value)
-    
-    db.commit()
-    db.refresh(db_user)
+    db_user = await update_returning(db, User, update_data, User.id == user_id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.commit()
+    invalidate_user_principals(user_id)
+    await invalidate_results(user_id, PROFILE)
     return db_user
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_permission("users:delete"))
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    db.delete(user)
-    db.commit()
+    await rollups.drop_user_rollups(db, user_id)
+    await db.delete(user)
+    await db.commit()
+    invalidate_user_principals(user_id)
+    await invalidate_results(user_id, *ALL_RESOURCES)
     return {"ok": True} 
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Maintenance commands, e.g. ``python -m app.cli rebuild-rollups``."""
+import argparse
+import asyncio
+from datetime import datetime
+from app.db.base import AsyncSessionLocal, SessionLocal, async_engine
+from app.services import rollups
+from app.services.invoicing import generate_invoices, month_period, previous_month
+from app.services.project_counters import reconcile_project_counters
+
+def rebuild_rollups(args) -> None:
+    with SessionLocal() as session:
+        processed = rollups.rebuild_rollups(
+            session, chunk_size=args.chunk_size, user_id=args.user_id
+        )
+    print(f"Rebuilt time rollups over {processed} time entry ids")
+
+def reconcile_counters(args) -> None:
+    with SessionLocal() as session:
+        repaired = reconcile_project_counters(session, batch_size=args.batch_size)
+    print(f"Repaired task counters of {repaired} projects")
+
+def _month(value: str) -> tuple:
+    try:
+        parsed = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected YYYY-MM")
+    return parsed.year, parsed.month
+
+async def _generate_invoices(period_start, period_end, user_id) -> dict:
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await generate_invoices(db, period_start, period_end, user_id=user_id)
+            await db.commit()
+    finally:
+        await async_engine.dispose()
+    return result
+
+def month_end_invoices(args) -> None:
+    year, month = args.month or previous_month(datetime.utcnow())
+    period_start, period_end = month_period(year, month)
+    result = asyncio.run(_generate_invoices(period_start, period_end, args.user_id))
+    print(f"{year:04d}-{month:02d}: created {result['created']} invoices, "
+          f"skipped {result['skipped']} already invoiced clients")
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-rollups", help="Recompute time_rollups from time_entries"
+    )
+    rebuild.add_argument("--chunk-size", type=int, default=50000)
+    rebuild.add_argument("--user-id", type=int, default=None)
+    rebuild.set_defaults(handler=rebuild_rollups)
+
+    reconcile = commands.add_parser(
+        "reconcile-counters", help="Repair drifted Project.total_tasks/completed_tasks"
+    )
+    reconcile.add_argument("--batch-size", type=int, default=1000)
+    reconcile.set_defaults(handler=reconcile_counters)
+
+    invoices = commands.add_parser(
+        "generate-invoices", help="Invoice every client for a month (rerunnable)"
+    )
+    invoices.add_argument("--month", type=_month, default=None, help="YYYY-MM, default: last month")
+    invoices.add_argument("--user-id", type=int, default=None)
+    invoices.set_defaults(handler=month_end_invoices)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
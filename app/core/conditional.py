@@ -0,0 +1,94 @@
+"""Conditional GET: ETag/Last-Modified validators and 304 replies.
+
+Validators come from row versions, so handlers can decide on a 304
+before loading or serializing the payload. Collections use an aggregate
+over the filtered rows: the count, max id and sum of versions change
+with every insert, delete or update. They get no Last-Modified, since
+the newest ``updated_at`` stays put when a row is deleted or leaves the
+filter, and If-Modified-Since would then answer 304 for a changed list.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Sequence
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    # Weak: equal versions mean equivalent, not byte-identical, JSON
+    return f'W/"{digest}"'
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second precision
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-None-Match wins over If-Modified-Since, as in RFC 9110."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+def check_conditional(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Put the validators on ``response``; return a 304 if the client is current.
+
+    ``last_modified`` is naive UTC, like every stored timestamp.
+    """
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+async def collection_etag(
+    db: AsyncSession,
+    model,
+    criteria: Sequence,
+    request: Request
+) -> str:
+    """ETag of the rows of ``model`` matching ``criteria``.
+
+    The query string is part of the ETag, so each page and filter of a
+    listing validates separately.
+    """
+    count, max_id, versions, last_modified = (await db.execute(
+        select(
+            func.count(),
+            func.max(model.id),
+            func.sum(model.version),
+            func.max(model.updated_at)
+        ).where(*criteria)
+    )).one()
+    return make_etag(
+        model.__tablename__, request.url.query, count, max_id, versions, last_modified
+    )
@@ -1,55 +1,123 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db.base import get_db
+from app.core.permissions import ADMIN_ROLE, parse_claims
+from app.db.base import get_async_db
+from app.db.replicas import replica_set
 from app.models.user import User
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/auth/login",
     auto_error=False
 )
 
+# token -> detached User carrying its token claims, tagged by ("user", user.id)
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+def invalidate_user_principals(user_id: int) -> None:
+    """Drop every cached principal of the given user."""
+    principal_cache.invalidate_tag(("user", user_id))
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def is_admin(user: User) -> bool:
+    # Roles come from the verified token claims, not from the database
+    return ADMIN_ROLE in user.claims.roles
+
+def has_permission(user: User, permission: str) -> bool:
+    return user.claims.has_permission(permission)
+
 async def get_current_user(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
-    logger.info("=== Token Validation Process Started ===")
+    if not token:
+        raise _credentials_exception()
+
+    user = principal_cache.get(token)
+    if user is not None:
+        # Role changes happen in the database, outside any endpoint that
+        # could invalidate the cache, so re-check the counter the triggers
+        # bump. A primary key lookup of one column is all a hit costs.
+        role_version = await db.scalar(select(User.role_version).where(User.id == user.id))
+        if role_version == user.role_version:
+            # Commits on this session pin the user's reads to the primary
+            db.info["user_id"] = user.id
+            return user
+        invalidate_user_principals(user.id)
+
     try:
-        if token:
-            logger.info("Found token in request header")
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            email = payload.get("sub")
-            if email:
-                logger.info(f"Email from header token: {email}")
-        else:
-            logger.info("No token in request header")
-            email = None
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
     except JWTError as e:
-        logger.error(f"Error decoding header token: {str(e)}")
-        email = None
+        logger.warning("Rejected token: %s", e)
+        raise _credentials_exception()
+    email = payload.get("sub")
+    if not email:
+        raise _credentials_exception()
+
+    # users.email is unique-indexed, so this is a single index lookup
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
     current_time = datetime.utcnow()
-    user = db.query(User).filter(
-        User.token_expires > current_time
-    ).first()
-    if not user:
-        logger.error("No user found with valid token")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    logger.info(f"Found authenticated user: {user.email}")
-    logger.info("=== Token Validation Process Completed ===")
+    if (
+        user is None
+        or user.access_token != token
+        or user.token_expires is None
+        or user.token_expires <= current_time
+    ):
+        raise _credentials_exception()
+
+    claims = parse_claims(payload)
+    if claims.role_version is not None and claims.role_version != user.role_version:
+        # Roles changed since login; the embedded claims are stale
+        logger.info("Rejected token of user %s: role version %s, current %s",
+                    user.id, claims.role_version, user.role_version)
+        raise _credentials_exception()
+
+    # Cached principals outlive the request session, so detach them with
+    # their attributes loaded.
+    db.expunge(user)
+    user.claims = claims
+    ttl = min(
+        settings.AUTH_CACHE_TTL_SECONDS,
+        (user.token_expires - current_time).total_seconds()
+    )
+    principal_cache.set(token, user, ttl=ttl, tags=[("user", user.id)])
+    db.info["user_id"] = user.id
     return user
 
+async def get_read_db(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Session for read-only endpoints: a replica, unless the user just wrote.
+
+    Falls back to the request's primary session; see app.db.replicas.
+    """
+    replica = replica_set.choose(current_user.id)
+    if replica is None:
+        yield db
+        return
+    async with replica.sessionmaker() as replica_db:
+        yield replica_db
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -60,9 +128,22 @@ async def get_current_active_user(
 async def get_current_admin_user(
     current_user: User = Depends(get_current_active_user)
 ) -> User:
-    if not any(role.name == "admin" for role in current_user.roles):
+    if not is_admin(current_user):
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have enough privileges"
         )
-    return current_user 
\ No newline at end of file
+    return current_user
+
+def require_permission(permission: str):
+    """Dependency admitting active users whose token grants ``permission``."""
+    async def dependency(
+        current_user: User = Depends(get_current_active_user)
+    ) -> User:
+        if not has_permission(current_user, permission):
+            raise HTTPException(
+                status_code=403,
+                detail="The user doesn't have enough privileges"
+            )
+        return current_user
+    return dependency
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from app.core import security
+from app.core.config import settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full or a caller waited too long."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing capacity exhausted")
+        self.retry_after = retry_after
+
+
+class HashingStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+
+    def record(self, wait: float, duration: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            self.hash_seconds_total += duration
+            self.hash_seconds_max = max(self.hash_seconds_max, duration)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool so it never blocks the event loop.
+
+    At most ``max_concurrency`` hashes run at once (bcrypt releases the GIL,
+    so they run in parallel); up to ``max_queue`` further callers wait for a
+    slot and anything beyond that is rejected with PasswordHasherBusy.
+    """
+
+    def __init__(
+        self,
+        rounds: int,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float
+    ):
+        self.rounds = rounds
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.stats = HashingStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        self._waiting = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(security.get_password_hash, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(security.verify_password, plain_password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return security.get_hash_rounds(hashed_password) != self.rounds
+
+    async def rehash(self, password: str) -> str:
+        hashed = await self.hash(password)
+        self.stats.rehashed += 1
+        return hashed
+
+    def snapshot(self) -> dict:
+        stats = self.stats
+        completed = stats.completed or 1
+        return {
+            "rounds": self.rounds,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "completed": stats.completed,
+            "rejected": stats.rejected,
+            "rehashed": stats.rehashed,
+            "wait_seconds_avg": stats.wait_seconds_total / completed,
+            "wait_seconds_max": stats.wait_seconds_max,
+            "hash_seconds_avg": stats.hash_seconds_total / completed,
+            "hash_seconds_max": stats.hash_seconds_max,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="password-hasher"
+            )
+        if self._loop is not loop:
+            # Semaphores are bound to the loop they are first used on
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+
+        queued_at = time.perf_counter()
+        if not self._slots.locked():
+            # A free slot is taken without suspending
+            await self._slots.acquire()
+        else:
+            if self._waiting >= self.max_queue:
+                self.stats.rejected += 1
+                raise PasswordHasherBusy(retry_after=self._retry_after())
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.stats.rejected += 1
+                raise PasswordHasherBusy(retry_after=self._retry_after())
+            finally:
+                self._waiting -= 1
+
+        self._in_flight += 1
+        started_at = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            finished_at = time.perf_counter()
+            self._in_flight -= 1
+            self._slots.release()
+            self.stats.record(started_at - queued_at, finished_at - started_at)
+
+    def _retry_after(self) -> int:
+        # Rough time to drain the current backlog, never less than a second
+        completed = self.stats.completed
+        avg = self.stats.hash_seconds_total / completed if completed else 0.25
+        backlog = self._waiting + self._in_flight
+        return max(1, int(avg * backlog / self.max_concurrency + 0.999))
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,275 @@
+"""Request and SQL metrics, exposed on /metrics and as Server-Timing headers.
+
+``MetricsMiddleware`` times every request and keeps an in-flight gauge.
+For the sampled share of requests it also opens a ``RequestTrace`` in a
+context variable; the SQLAlchemy hooks installed by ``instrument_engine``
+add each statement's count and duration to it, so unsampled requests pay
+one context lookup per statement. Slow statements and statements repeated
+within one request (N+1 patterns) are kept as samples for the internal
+endpoint.
+"""
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, Prometheus style."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.series = defaultdict(lambda: [[0] * len(buckets), 0.0, 0])
+
+    def observe(self, labels: tuple, value: float) -> None:
+        counts, _, _ = series = self.series[labels]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        series[1] += value
+        series[2] += 1
+
+
+class RequestTrace:
+    """SQL activity of one sampled request."""
+
+    __slots__ = ("scope", "statements", "db_seconds", "fingerprints")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.fingerprints = Counter()
+
+
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = Counter()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sampled = Counter()
+        self.statements = Counter()
+        self.db_seconds = Counter()
+        self.statements_per_request = Histogram(STATEMENT_BUCKETS)
+        self.slow_queries = Counter()
+        self.n_plus_one = Counter()
+        self.slow_query_samples = deque(maxlen=settings.METRICS_SAMPLE_LIMIT)
+        self.n_plus_one_samples = deque(maxlen=settings.METRICS_SAMPLE_LIMIT)
+
+    def record_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        trace: Optional[RequestTrace]
+    ) -> None:
+        labels = (method, route)
+        with self._lock:
+            self.requests[(method, route, str(status_code))] += 1
+            self.latency.observe(labels, seconds)
+            if trace is None:
+                return
+            self.sampled[labels] += 1
+            self.statements[labels] += trace.statements
+            self.db_seconds[labels] += trace.db_seconds
+            self.statements_per_request.observe(labels, trace.statements)
+
+        threshold = settings.METRICS_N_PLUS_ONE_THRESHOLD
+        for statement, count in trace.fingerprints.items():
+            if count < threshold:
+                continue
+            with self._lock:
+                self.n_plus_one[labels] += 1
+            self.n_plus_one_samples.append({
+                "route": f"{method} {route}",
+                "statement": statement,
+                "executions": count,
+                "at": time.time(),
+            })
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %.200s",
+                method, route, count, statement
+            )
+
+    def record_slow_query(self, trace: Optional[RequestTrace], statement: str, seconds: float) -> None:
+        route = _route(trace.scope) if trace is not None else None
+        with self._lock:
+            self.slow_queries[route or UNMATCHED_ROUTE] += 1
+        self.slow_query_samples.append({
+            "route": route,
+            "statement": statement,
+            "duration_ms": round(seconds * 1000, 3),
+            "at": time.time(),
+        })
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric."""
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(**values):
+            return "{" + ",".join(
+                f'{key}="{_escape(value)}"' for key, value in values.items()
+            ) + "}"
+
+        def histogram(name, hist, help_text):
+            header(name, "histogram", help_text)
+            for (method, route), (counts, total, count) in sorted(hist.series.items()):
+                for bound, bucket_count in zip(hist.buckets, counts):
+                    lines.append(f"{name}_bucket{labels(method=method, route=route, le=bound)} {bucket_count}")
+                lines.append(f"{name}_bucket{labels(method=method, route=route, le='+Inf')} {count}")
+                lines.append(f"{name}_sum{labels(method=method, route=route)} {total}")
+                lines.append(f"{name}_count{labels(method=method, route=route)} {count}")
+
+        def counter(name, values, help_text, names=("method", "route")):
+            header(name, "counter", help_text)
+            for key, value in sorted(values.items()):
+                key = key if isinstance(key, tuple) else (key,)
+                lines.append(f"{name}{labels(**dict(zip(names, key)))} {value}")
+
+        with self._lock:
+            header("http_requests_in_flight", "gauge", "Requests currently being served")
+            lines.append(f"http_requests_in_flight {self.in_flight}")
+            counter("http_requests_total", self.requests, "Requests served",
+                    names=("method", "route", "status"))
+            histogram("http_request_duration_seconds", self.latency, "Request latency")
+            counter("http_requests_sampled_total", self.sampled,
+                    "Requests whose SQL activity was traced")
+            counter("db_statements_total", self.statements, "SQL statements run by traced requests")
+            counter("db_time_seconds_total", self.db_seconds, "SQL time spent by traced requests")
+            histogram("db_statements_per_request", self.statements_per_request,
+                      "SQL statements per traced request")
+            counter("db_slow_queries_total", self.slow_queries,
+                    "Statements slower than METRICS_SLOW_QUERY_MS", names=("route",))
+            counter("db_n_plus_one_total", self.n_plus_one,
+                    "Statements run METRICS_N_PLUS_ONE_THRESHOLD times or more within one traced request")
+        return "\n".join(lines) + "\n"
+
+    def samples(self) -> dict:
+        return {
+            "slow_queries": list(self.slow_query_samples),
+            "n_plus_one": list(self.n_plus_one_samples),
+        }
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    elapsed = time.perf_counter() - started
+    trace = current_trace.get()
+    if trace is not None:
+        trace.statements += 1
+        trace.db_seconds += elapsed
+        trace.fingerprints[statement] += 1
+    if elapsed * 1000 >= settings.METRICS_SLOW_QUERY_MS:
+        metrics.record_slow_query(trace, statement, elapsed)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None:
+        started = connection.info.get("query_started_at")
+        if started:
+            started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement run on ``engine`` (pass ``async_engine.sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and SQL traces."""
+
+    def __init__(self, app, sample_rate: float = 1.0, server_timing: bool = True):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = None
+        if self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+            trace = RequestTrace(scope)
+        token = current_trace.set(trace)
+        started = time.perf_counter()
+        status_code = 500
+        metrics.in_flight += 1
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if trace is not None and self.server_timing:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", _server_timing(trace, started).encode())
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            metrics.in_flight -= 1
+            current_trace.reset(token)
+            metrics.record_request(
+                scope["method"], _route(scope), status_code,
+                time.perf_counter() - started, trace
+            )
+
+
+def _route(scope) -> str:
+    """Route template of the request, e.g. ``/api/tasks/{task_id}``.
+
+    Labels use templates rather than raw paths to bound cardinality.
+    Routes included under a prefix may only know their own part of the
+    template, so the prefix is taken from the matching leading segments of
+    the request path.
+    """
+    template = getattr(scope.get("route"), "path_format", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    prefix = scope["path"].rsplit("/", template.count("/"))[0]
+    return prefix + template
+
+
+def _server_timing(trace: RequestTrace, started: float) -> str:
+    app_ms = (time.perf_counter() - started) * 1000
+    return (
+        f'app;dur={app_ms:.1f}, '
+        f'db;dur={trace.db_seconds * 1000:.1f};desc="{trace.statements} queries"'
+    )
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence
+from fastapi import HTTPException, Response
+from sqlalchemy import bindparam, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Sequence) -> str:
+    """Pack the sort key of the last row into an opaque URL-safe token."""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_page(query, order_by: Sequence, cursor: Optional[str], limit: int):
+    """Order ``query`` by ``order_by`` and start it after ``cursor``.
+
+    ``order_by`` must end with a unique column so the order is total.
+    One extra row is fetched so ``finish_page`` can tell if more remain.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(order_by))
+        bounds = [
+            bindparam(None, value, type_=column.type)
+            for column, value in zip(order_by, values)
+        ]
+        query = query.where(tuple_(*order_by) > tuple_(*bounds))
+    return query.order_by(*order_by).limit(limit + 1)
+
+def finish_page(rows: list, order_by: Sequence, limit: int, response: Response) -> list:
+    """Trim the look-ahead row and advertise the next cursor, if any."""
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    last = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+        [getattr(last, column.key) for column in order_by]
+    )
+    return rows
@@ -0,0 +1,60 @@
+"""Role and permission claims carried in access tokens.
+
+Roles are resolved once at login and embedded in the JWT together with
+the user's ``role_version``. Database triggers bump that counter on every
+change to ``user_role``, so when ``get_current_user`` loads the user row
+it can tell whether the token's claims are still current. Authorization
+checks then read the claims and never touch the database.
+"""
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, Optional
+
+ADMIN_ROLE = "admin"
+
+# Permissions granted by each role; unknown roles grant nothing
+ROLE_PERMISSIONS = {
+    ADMIN_ROLE: frozenset({
+        "users:read",
+        "users:write",
+        "users:delete",
+        "internal:read",
+        "time_statistics:read_any",
+        "invoices:batch",
+    }),
+}
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    roles: FrozenSet[str] = frozenset()
+    permissions: FrozenSet[str] = frozenset()
+    role_version: Optional[int] = None
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions
+
+
+def permissions_for(roles: Iterable[str]) -> FrozenSet[str]:
+    granted = set()
+    for role in roles:
+        granted |= ROLE_PERMISSIONS.get(role, frozenset())
+    return frozenset(granted)
+
+
+def role_claims(role_names: Iterable[str], role_version: int) -> dict:
+    """JWT claims for a user with ``role_names`` at ``role_version``."""
+    roles = sorted(set(role_names))
+    return {
+        "roles": roles,
+        "perms": sorted(permissions_for(roles)),
+        "rv": role_version,
+    }
+
+
+def parse_claims(payload: dict) -> TokenClaims:
+    # Tokens issued before role claims existed carry no roles
+    return TokenClaims(
+        roles=frozenset(payload.get("roles") or ()),
+        permissions=frozenset(payload.get("perms") or ()),
+        role_version=payload.get("rv"),
+    )
@@ -0,0 +1,138 @@
+"""Token-bucket rate limiting for the password-hashing auth routes.
+
+Each bucket holds up to ``burst`` tokens and refills at ``per_minute``.
+A request needs one token and is answered with 429 and Retry-After when
+the bucket is empty. This is checked before any database or bcrypt work,
+so a rejected request costs a dictionary lookup.
+
+Buckets live in a ``RateLimitBackend``. ``MemoryRateLimitBackend`` keeps
+them in-process, so each worker enforces its own limits.
+RATE_LIMIT_BACKEND may instead name a shared implementation as
+``package.module:Class``, for example one running the same arithmetic in
+a Redis script, so that all workers draw from the same buckets.
+"""
+import importlib
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from app.core.config import settings
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets; implementations must update atomically."""
+
+    @abstractmethod
+    async def take(self, key: str, per_minute: float, burst: int, cost: float = 1.0) -> float:
+        """Remove ``cost`` tokens from the bucket ``key``.
+
+        Returns 0 if the bucket held at least one token, and otherwise
+        the seconds until it will, without removing anything. A ``cost``
+        of 0 only checks.
+        """
+
+    def snapshot(self) -> dict:
+        return {}
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets in an LRU bounded to ``max_keys`` entries."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (tokens, refilled_at)
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, per_minute: float, burst: int, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        rate = per_minute / 60.0
+        with self._lock:
+            tokens, refilled_at = self._buckets.pop(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - refilled_at) * rate)
+            if tokens >= 1.0:
+                wait = 0.0
+                tokens -= cost
+            else:
+                # A zero rate never refills; report a minute
+                wait = (1.0 - tokens) / rate if rate > 0 else 60.0
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                # An evicted bucket starts over full, which only errs lenient
+                self._buckets.popitem(last=False)
+        return wait
+
+    def snapshot(self) -> dict:
+        return {"keys": len(self._buckets), "max_keys": self.max_keys}
+
+
+def load_backend(spec: str) -> RateLimitBackend:
+    if spec == "memory":
+        return MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+    module_name, _, class_name = spec.partition(":")
+    # Instantiating raises TypeError at import if an abstract method is missing
+    backend = getattr(importlib.import_module(module_name), class_name)()
+    if not isinstance(backend, RateLimitBackend):
+        raise TypeError(f"RATE_LIMIT_BACKEND {spec} is not a RateLimitBackend")
+    return backend
+
+
+class AuthRateLimiter:
+    """Per client IP and per email limits for login and registration."""
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+        self.limited = 0
+
+    def client_ip(self, request: Request) -> str:
+        if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                # The last hop was appended by our own proxy
+                return forwarded.split(",")[-1].strip()
+        return request.client.host if request.client else "unknown"
+
+    async def check_ip(self, request: Request) -> None:
+        """Spend one token of the caller's IP bucket."""
+        await self._take(
+            f"ip:{self.client_ip(request)}",
+            settings.RATE_LIMIT_IP_PER_MINUTE,
+            settings.RATE_LIMIT_IP_BURST,
+        )
+
+    async def check_email(self, email: str, cost: float = 1.0) -> None:
+        """Spend ``cost`` tokens of the email's bucket; 0 only checks."""
+        await self._take(
+            f"email:{email.lower()}",
+            settings.RATE_LIMIT_EMAIL_PER_MINUTE,
+            settings.RATE_LIMIT_EMAIL_BURST,
+            cost,
+        )
+
+    async def charge_email(self, email: str) -> None:
+        """Record a failed attempt against the email's bucket."""
+        if settings.RATE_LIMIT_ENABLED:
+            await self.backend.take(
+                f"email:{email.lower()}",
+                settings.RATE_LIMIT_EMAIL_PER_MINUTE,
+                settings.RATE_LIMIT_EMAIL_BURST,
+            )
+
+    def snapshot(self) -> dict:
+        return dict(self.backend.snapshot(), enabled=settings.RATE_LIMIT_ENABLED, limited=self.limited)
+
+    async def _take(self, key: str, per_minute: float, burst: int, cost: float = 1.0) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        wait = await self.backend.take(key, per_minute, burst, cost)
+        if wait > 0:
+            self.limited += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts, please retry later",
+                headers={"Retry-After": str(max(1, int(wait + 0.999)))},
+            )
+
+
+auth_rate_limiter = AuthRateLimiter(load_backend(settings.RATE_LIMIT_BACKEND))
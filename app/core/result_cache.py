@@ -0,0 +1,262 @@
+"""Cache of per-user read results, invalidated by tags from the write paths.
+
+Entries are keyed by name, user and query string (``result_key``). Each
+is tagged with the user's resources it was built from, such as
+``tasks:42``. After committing, a write endpoint calls
+``invalidate_results(user_id, *resources)`` with the resources it
+changed. That drops every entry of the user carrying one of those tags.
+
+Storage is a ``ResultCacheBackend``. ``MemoryResultCacheBackend`` is an
+in-process LRU bounded by RESULT_CACHE_MAX_ENTRIES and
+RESULT_CACHE_MAX_BYTES. Its invalidations reach only its own process,
+so ``python -m app.server`` disables the cache when it starts more than
+one worker with it. RESULT_CACHE_BACKEND may instead name a shared
+implementation as ``package.module:Class``, so that an invalidation
+reaches every worker.
+
+Within a process, concurrent misses on one key are coalesced: one
+request computes the result and the others wait for it. A result is not
+stored if one of its tags was invalidated while it was being computed,
+since it may predate the write.
+
+HTTP responses are stored as ``CachedResponse`` with their validators.
+``replay`` answers conditional requests from them, so a poll of a single
+resource that hits the cache runs no queries at all. Listings first run
+their cheap version query, which decides a 304 by itself, and cache
+pages under the resulting ETag.
+"""
+import asyncio
+import importlib
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Sequence
+from urllib.parse import urlencode
+import orjson
+from fastapi import Request, Response
+from app.core.cache import TTLCache
+from app.core.conditional import is_not_modified, validator_headers
+from app.core.config import settings
+
+# Resources whose writes invalidate cached results, tagged per user
+PROJECTS = "projects"
+TASKS = "tasks"
+TIME_ENTRIES = "time_entries"
+PROFILE = "profile"
+ALL_RESOURCES = (PROJECTS, TASKS, TIME_ENTRIES, PROFILE)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: tuple
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def cache_entry(
+    body: bytes,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    headers=()
+) -> CachedResponse:
+    """A 200 JSON response with its validators and any extra ``headers``."""
+    merged = {"content-type": "application/json"}
+    merged.update((name.lower(), value) for name, value in dict(headers).items())
+    merged.update((name.lower(), value) for name, value in validator_headers(etag, last_modified).items())
+    merged.pop("content-length", None)
+    return CachedResponse(body, tuple(merged.items()), etag, last_modified)
+
+def replay(request: Request, entry: CachedResponse) -> Response:
+    if is_not_modified(request, entry.etag, entry.last_modified):
+        return Response(status_code=304, headers=validator_headers(entry.etag, entry.last_modified))
+    return Response(entry.body, headers=dict(entry.headers))
+
+def result_size(value: Any) -> int:
+    if isinstance(value, CachedResponse):
+        return len(value.body) + sum(len(name) + len(text) for name, text in value.headers)
+    return len(orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS))
+
+def result_key(
+    name: str,
+    user_id: int,
+    request: Optional[Request] = None,
+    version: str = ""
+) -> str:
+    """Cache key of a result; a ``version`` such as an ETag is appended."""
+    query = urlencode(sorted(request.query_params.multi_items())) if request is not None else ""
+    key = f"{name}:{user_id}?{query}"
+    return f"{key}#{version}" if version else key
+
+def user_tags(user_id: int, *resources: str) -> list:
+    return [f"{resource}:{user_id}" for resource in resources]
+
+
+class ResultCacheBackend(ABC):
+    """Storage for cached results; implementations must honour ``ttl`` and tags.
+
+    Values are ``CachedResponse`` tuples or dicts of JSON-like data that may
+    include datetimes and enums.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """The value stored under ``key``, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float, tags: Sequence[str]) -> None:
+        """Store ``value`` for ``ttl`` seconds under every tag in ``tags``."""
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Sequence[str]) -> None:
+        """Drop every value stored under any of ``tags``."""
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryResultCacheBackend(ResultCacheBackend):
+    """Per-process LRU bounded by entry count and by encoded size."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.cache = TTLCache(
+            maxsize=max_entries,
+            ttl=settings.RESULT_CACHE_TTL_SECONDS,
+            maxbytes=max_bytes,
+            sizeof=result_size
+        )
+
+    async def get(self, key: str) -> Any:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float, tags: Sequence[str]) -> None:
+        self.cache.set(key, value, ttl=ttl, tags=tags)
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> None:
+        for tag in tags:
+            self.cache.invalidate_tag(tag)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+def load_backend(spec: str) -> ResultCacheBackend:
+    if spec == "memory":
+        return MemoryResultCacheBackend(settings.RESULT_CACHE_MAX_ENTRIES, settings.RESULT_CACHE_MAX_BYTES)
+    module_name, _, class_name = spec.partition(":")
+    # Instantiating raises TypeError at import if an abstract method is missing
+    backend = getattr(importlib.import_module(module_name), class_name)()
+    if not isinstance(backend, ResultCacheBackend):
+        raise TypeError(f"RESULT_CACHE_BACKEND {spec} is not a ResultCacheBackend")
+    return backend
+
+
+class _Flight:
+    """Computations of one key in progress, and whether they went stale."""
+
+    def __init__(self, tags: Sequence[str]):
+        self.lock = asyncio.Lock()
+        self.tags = frozenset(tags)
+        self.waiters = 0
+        self.stale = False
+
+
+class ResultCache:
+    def __init__(self, backend: ResultCacheBackend):
+        self.backend = backend
+        self._flights: Dict[str, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale_results = 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        tags: Sequence[str],
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """The cached value of ``key``, computing and storing it on a miss.
+
+        Exceptions from ``compute`` propagate and nothing is stored.
+        """
+        if not settings.RESULT_CACHE_ENABLED:
+            return await compute()
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(tags)
+        flight.waiters += 1
+        try:
+            async with flight.lock:
+                # Whoever held the lock may have stored the value meanwhile
+                value = await self.backend.get(key)
+                if value is not None:
+                    self.coalesced += 1
+                    return value
+                self.misses += 1
+                flight.stale = False
+                value = await compute()
+                if flight.stale:
+                    self.stale_results += 1
+                elif value is not None:
+                    ttl = settings.RESULT_CACHE_TTL_SECONDS if ttl is None else ttl
+                    await self.backend.set(key, value, ttl, tags)
+                return value
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters:
+                del self._flights[key]
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> None:
+        tags = frozenset(tags)
+        for flight in self._flights.values():
+            if flight.tags & tags:
+                flight.stale = True
+        await self.backend.invalidate_tags(list(tags))
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": settings.RESULT_CACHE_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale_results": self.stale_results,
+            "in_flight": len(self._flights),
+            "backend": self.backend.stats(),
+        }
+
+    def render(self) -> str:
+        """Prometheus text exposition, appended to /metrics."""
+        stats = self.backend.stats()
+        lines = [
+            "# HELP result_cache_requests_total Result cache lookups by outcome",
+            "# TYPE result_cache_requests_total counter",
+            f'result_cache_requests_total{{result="hit"}} {self.hits}',
+            f'result_cache_requests_total{{result="miss"}} {self.misses}',
+            f'result_cache_requests_total{{result="coalesced"}} {self.coalesced}',
+            "# HELP result_cache_stale_results_total Results not stored because a write invalidated them mid-computation",
+            "# TYPE result_cache_stale_results_total counter",
+            f"result_cache_stale_results_total {self.stale_results}",
+        ]
+        for name, kind, help_text in (
+            ("evictions", "counter", "Entries evicted for space"),
+            ("expirations", "counter", "Entries found expired"),
+            ("invalidations", "counter", "Entries dropped by write invalidation"),
+            ("entries", "gauge", "Entries stored"),
+            ("bytes", "gauge", "Encoded size of the stored entries"),
+        ):
+            if name in stats:
+                metric = f"result_cache_{name}_total" if kind == "counter" else f"result_cache_{name}"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}", f"{metric} {stats[name]}"]
+        return "\n".join(lines) + "\n"
+
+
+result_cache = ResultCache(load_backend(settings.RESULT_CACHE_BACKEND))
+
+async def invalidate_results(user_id: int, *resources: str) -> None:
+    """Drop ``user_id``'s cached results built from any of ``resources``."""
+    await result_cache.invalidate_tags(user_tags(user_id, *resources))
@@ -0,0 +1,40 @@
+"""Cold-start timing, from process start to serving the first request.
+
+``app.main`` creates a StartupTimer before its other imports and marks
+when the module finished importing and when startup handlers completed.
+On Linux the process age at that first moment, reported as
+``before_app_import_seconds``, is read from /proc and covers interpreter
+start-up and the server's own imports.
+"""
+import os
+import time
+from typing import Optional
+
+def process_age_seconds() -> Optional[float]:
+    """Seconds since this process started, or None where /proc is missing."""
+    try:
+        with open("/proc/self/stat") as stat:
+            # Fields after the parenthesised command name; starttime is 22nd overall
+            fields = stat.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as uptime:
+            system_uptime = float(uptime.read().split()[0])
+        return system_uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.process_age = process_age_seconds()
+        self.marks = {}
+
+    def mark(self, name: str) -> float:
+        elapsed = time.perf_counter() - self.started
+        self.marks[name] = elapsed
+        return elapsed
+
+    def snapshot(self) -> dict:
+        data = {f"{name}_seconds": round(value, 4) for name, value in self.marks.items()}
+        if self.process_age is not None:
+            data["before_app_import_seconds"] = round(self.process_age, 2)
+        return data
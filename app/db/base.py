@@ -1,15 +1,13 @@
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from app.core.config import settings
+from app.db.session import engine, SessionLocal, async_engine, AsyncSessionLocal
 from app.models.base import Base
-import os
-
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTelemetry:
+    """Live counters for one engine's connection pool."""
+
+    def __init__(self, name: str, wait_warn_seconds: float):
+        self.name = name
+        self.wait_warn_seconds = wait_warn_seconds
+        self._lock = threading.Lock()
+        self._connected_at = {}
+        self.engine = None
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.held_seconds_total = 0.0
+        self.held_seconds_max = 0.0
+        self.checkins = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        if seconds >= self.wait_warn_seconds:
+            logger.warning(
+                "Pool %s: waited %.3fs for a connection (%s)",
+                self.name, seconds, self._status()
+            )
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        logger.error("Pool %s exhausted: %s", self.name, self._status())
+
+    def attach(self, engine: Engine) -> None:
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "close_detached", self._on_close)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - started for started in self._connected_at.values()]
+            waits = self.waits or 1
+            checkins = self.checkins or 1
+            data = {
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "open_connections": len(ages),
+                "connection_age_seconds_max": max(ages) if ages else 0.0,
+                "connection_age_seconds_avg": sum(ages) / len(ages) if ages else 0.0,
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_avg": self.wait_seconds_total / waits,
+                "wait_seconds_max": self.wait_seconds_max,
+                "held_seconds_avg": self.held_seconds_total / checkins,
+                "held_seconds_max": self.held_seconds_max,
+            }
+        data.update(self._pool_counts(pool))
+        return data
+
+    def _status(self) -> str:
+        pool = self.engine.pool if self.engine is not None else None
+        return pool.status() if pool is not None else "no pool"
+
+    @staticmethod
+    def _pool_counts(pool) -> dict:
+        counts = {}
+        for key in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, key, None)
+            counts[key] = method() if callable(method) else None
+        return counts
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+            self._connected_at[id(connection_record)] = time.monotonic()
+        logger.debug("Pool %s: opened connection", self.name)
+
+    def _on_close(self, dbapi_connection, connection_record=None):
+        with self._lock:
+            self.closes += 1
+            if connection_record is not None:
+                self._connected_at.pop(id(connection_record), None)
+        logger.debug("Pool %s: closed connection", self.name)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+            self._connected_at.pop(id(connection_record), None)
+        logger.warning("Pool %s: connection invalidated: %s", self.name, exception)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.monotonic()
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        held = time.monotonic() - started
+        with self._lock:
+            self.checkins += 1
+            self.held_seconds_total += held
+            self.held_seconds_max = max(self.held_seconds_max, held)
+
+
+def instrumented_pool_class(base, telemetry: PoolTelemetry):
+    """Subclass a queue pool so checkout wait time and timeouts are recorded.
+
+    The telemetry lives on the class so it survives ``pool.recreate()``.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            self.telemetry.record_timeout()
+            raise
+        self.telemetry.record_wait(time.perf_counter() - started)
+        return connection
+
+    return type(
+        "Instrumented" + base.__name__,
+        (base,),
+        {"telemetry": telemetry, "_do_get": _do_get}
+    )
+
+
+# engine name -> telemetry, read by the internal pool endpoint
+registry = {}
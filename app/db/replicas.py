@@ -0,0 +1,229 @@
+"""Read replicas and the routing of read-only requests to them.
+
+DATABASE_REPLICA_URLS lists replica databases. Read-only endpoints take
+their session from ``get_read_db`` (app.core.dependencies). That session
+is on a usable replica, picked round robin, or on the request's primary
+session when no replica applies. Every other endpoint keeps
+``get_async_db`` and the primary.
+
+Read-your-writes: ``get_current_user`` records the user in the primary
+session's ``info``. Committing that session pins the user's reads to the
+primary for REPLICA_STICKY_SECONDS, by which time replicas within
+REPLICA_MAX_LAG_SECONDS have the write. Pins are kept per process, so
+with several workers a user's next request can still reach a worker
+that routes it to a replica.
+
+Health: every REPLICA_CHECK_INTERVAL_SECONDS each replica must answer
+within HEALTH_DB_TIMEOUT_SECONDS, be streaming WAL from the primary, and
+report replay lag no greater than REPLICA_MAX_LAG_SECONDS. Otherwise it
+gets no reads until a later check passes. When no replica is usable, reads go to the primary.
+
+Local mode: when the primary is a SQLite file, each SQLite replica is
+overwritten with a copy of the primary at every check. This stands in
+for streaming replication with up to one interval of lag::
+
+    DATABASE_URL=sqlite:///./primary.db
+    DATABASE_REPLICA_URLS='["sqlite:///./replica.db"]'
+"""
+import asyncio
+import itertools
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import PrimarySession, build_engine, to_async_url
+
+logger = logging.getLogger(__name__)
+
+# Replaying everything received only means "no lag" while the WAL
+# receiver is streaming; a disconnected replica has also replayed all it
+# received. Reading pg_stat_wal_receiver.status needs pg_read_all_stats.
+POSTGRESQL_LAG_QUERY = text("""
+    SELECT pg_is_in_recovery() AS in_recovery,
+           EXISTS (
+               SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+           ) AS streaming,
+           pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() AS caught_up,
+           EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS replay_age
+""")
+
+
+class ReplicaDisconnected(Exception):
+    """The replica's WAL receiver is not streaming from the primary."""
+
+def _sqlite_file(url) -> Optional[str]:
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database
+
+def copy_sqlite_database(source: str, target: str) -> None:
+    with closing(sqlite3.connect(source)) as primary, closing(sqlite3.connect(target)) as replica:
+        primary.backup(replica)
+
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = make_url(url)
+        self.engine = build_engine(to_async_url(url), name)
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        # Unusable until the first check passes
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.reads = 0
+
+    @property
+    def usable(self) -> bool:
+        # Unknown lag (nothing replayed yet) is never within the bound
+        return (
+            self.healthy
+            and self.lag_seconds is not None
+            and self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+        )
+
+    async def measure_lag(self) -> Optional[float]:
+        """Replay lag in seconds, or None if the replica never replayed anything.
+
+        Raises ReplicaDisconnected when the WAL receiver is not streaming.
+        """
+        async with self.engine.connect() as connection:
+            if self.url.get_backend_name() != "postgresql":
+                await connection.execute(text("SELECT 1"))
+                return 0.0
+            row = (await connection.execute(POSTGRESQL_LAG_QUERY)).one()
+        return self.replay_lag(row)
+
+    def replay_lag(self, row) -> Optional[float]:
+        """The lag reported by a POSTGRESQL_LAG_QUERY row."""
+        if not row.in_recovery:
+            return 0.0
+        age = float(row.replay_age) if row.replay_age is not None else None
+        if not row.streaming:
+            self.lag_seconds = age
+            raise ReplicaDisconnected(
+                "WAL receiver is not streaming; "
+                + (f"last replay {age:.1f}s ago" if age is not None else "nothing replayed")
+            )
+        return 0.0 if row.caught_up else age
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "url": self.url.render_as_string(hide_password=True),
+            "healthy": self.healthy,
+            "usable": self.usable,
+            "lag_seconds": self.lag_seconds,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "error": self.error,
+            "reads": self.reads,
+        }
+
+
+class ReplicaSet:
+    def __init__(self, primary_url: str, replica_urls: List[str]):
+        self.primary_file = _sqlite_file(make_url(primary_url))
+        self.replicas = [
+            Replica(f"replica{index}", url) for index, url in enumerate(replica_urls)
+        ]
+        # user id -> True while the user's reads must see the primary
+        self.pinned = TTLCache(
+            maxsize=settings.REPLICA_STICKY_MAX_USERS,
+            ttl=settings.REPLICA_STICKY_SECONDS
+        )
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.pinned_reads = 0
+        self.fallback_reads = 0
+
+    def pin(self, user_id: int) -> None:
+        if self.replicas:
+            self.pinned.set(user_id, True)
+
+    def choose(self, user_id: int) -> Optional[Replica]:
+        """The replica to serve ``user_id``'s reads, or None for the primary."""
+        if not self.replicas:
+            return None
+        if self.pinned.get(user_id):
+            self.pinned_reads += 1
+            return None
+        usable = [replica for replica in self.replicas if replica.usable]
+        if not usable:
+            self.fallback_reads += 1
+            return None
+        replica = usable[next(self._next) % len(usable)]
+        replica.reads += 1
+        return replica
+
+    async def check_replica(self, replica: Replica) -> None:
+        try:
+            replica_file = _sqlite_file(replica.url)
+            if self.primary_file and replica_file:
+                await asyncio.to_thread(copy_sqlite_database, self.primary_file, replica_file)
+            lag = await asyncio.wait_for(replica.measure_lag(), settings.HEALTH_DB_TIMEOUT_SECONDS)
+        except Exception as e:
+            if replica.healthy:
+                logger.warning("Replica %s failed its health check: %r", replica.name, e)
+            replica.healthy = False
+            replica.error = repr(e)
+        else:
+            if not replica.healthy:
+                logger.info("Replica %s is healthy, lag %ss", replica.name, lag)
+            elif lag is None:
+                logger.warning("Replica %s has not replayed anything from the primary", replica.name)
+            elif lag > settings.REPLICA_MAX_LAG_SECONDS:
+                logger.warning("Replica %s lags %.1fs behind the primary", replica.name, lag)
+            replica.healthy = True
+            replica.lag_seconds = lag
+            replica.error = None
+        replica.checked_at = datetime.utcnow()
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self.check_replica(replica) for replica in self.replicas))
+
+    async def _check_forever(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REPLICA_CHECK_INTERVAL_SECONDS)
+            await self.check()
+
+    async def start(self) -> None:
+        """Check every replica once, then keep checking in the background."""
+        if self.replicas and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._check_forever())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def snapshot(self) -> dict:
+        return {
+            "replicas": [replica.snapshot() for replica in self.replicas],
+            "pinned_users": len(self.pinned),
+            "pinned_reads": self.pinned_reads,
+            "fallback_reads": self.fallback_reads,
+        }
+
+
+replica_set = ReplicaSet(settings.DATABASE_URL, settings.DATABASE_REPLICA_URLS)
+
+@event.listens_for(PrimarySession, "after_commit")
+def _pin_committing_user(session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        replica_set.pin(user_id)
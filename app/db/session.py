@@ -1,6 +1,91 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.db import pool as pool_telemetry
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
+# Async drivers used for each sync dialect found in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching asyncio driver."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def _connect_args(url) -> dict:
+    """Per-driver connect arguments for statement_timeout and application_name."""
+    if url.get_backend_name() != "postgresql":
+        return {}
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if url.get_driver_name() == "asyncpg":
+        server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+        if timeout:
+            server_settings["statement_timeout"] = str(timeout)
+        return {"server_settings": server_settings}
+    args = {"application_name": settings.DB_APPLICATION_NAME}
+    if timeout:
+        args["options"] = f"-c statement_timeout={timeout}"
+    return args
+
+def engine_options(url: str, name: str) -> dict:
+    """Engine keyword arguments for ``url`` built from the DB_* settings."""
+    parsed = make_url(url)
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": _connect_args(parsed),
+    }
+    if parsed.get_backend_name() == "sqlite":
+        # SQLite picks its own pool class; sizing options don't apply
+        return options
+
+    telemetry = pool_telemetry.registry[name]
+    base_pool = AsyncAdaptedQueuePool if parsed.get_dialect().is_async else QueuePool
+    options.update(
+        poolclass=pool_telemetry.instrumented_pool_class(base_pool, telemetry),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+def build_engine(url: str, name: str):
+    """Create an engine for ``url`` with pool settings and telemetry attached.
+
+    Async URLs get an AsyncEngine; telemetry is registered under ``name``.
+    """
+    telemetry = pool_telemetry.PoolTelemetry(
+        name, wait_warn_seconds=settings.DB_POOL_WAIT_WARN_MS / 1000
+    )
+    pool_telemetry.registry[name] = telemetry
+    options = engine_options(url, name)
+    if make_url(url).get_dialect().is_async:
+        engine = create_async_engine(url, **options)
+        telemetry.attach(engine.sync_engine)
+    else:
+        engine = create_engine(url, **options)
+        telemetry.attach(engine)
+    return engine
+
+engine = build_engine(settings.DATABASE_URL, "sync")
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class PrimarySession(Session):
+    """Sync session behind AsyncSessionLocal; app.db.replicas watches its commits."""
+
+async_engine = build_engine(to_async_url(settings.DATABASE_URL), "async")
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    autoflush=False,
+    expire_on_commit=False,
+)
@@ -0,0 +1,39 @@
+"""Single-statement writes through INSERT/UPDATE ... RETURNING.
+
+Each helper returns the written row as an ORM object, server-generated
+columns included, so a handler needs no SELECT before or refresh after.
+Ownership checks belong in the statement itself: ``criteria`` for
+updates, an ``exists`` guard for inserts. A row the caller may not touch
+comes back as None.
+"""
+from typing import Optional
+from sqlalchemy import insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+async def insert_returning(db: AsyncSession, model, values: dict, guard=None):
+    """INSERT one row and return it, or None if ``guard`` is false.
+
+    ``guard`` is a boolean SQL expression, typically ``select(...).exists()``,
+    evaluated in the same statement as ``INSERT ... SELECT ... WHERE guard``.
+    """
+    stmt = insert(model)
+    if guard is None:
+        stmt = stmt.values(**values)
+    else:
+        columns = model.__table__.c
+        source = select(*[
+            literal(value, type_=columns[name].type) for name, value in values.items()
+        ]).where(guard)
+        stmt = stmt.from_select(list(values), source)
+    return await db.scalar(
+        stmt.returning(model).execution_options(populate_existing=True)
+    )
+
+async def update_returning(db: AsyncSession, model, values: dict, *criteria) -> Optional[object]:
+    """UPDATE the row matching ``criteria`` and return it, or None if none matched."""
+    if not values:
+        return await db.scalar(select(model).where(*criteria))
+    return await db.scalar(
+        update(model).where(*criteria).values(**values).returning(model)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
@@ -1,6 +1,28 @@
-from fastapi import FastAPI
+# Timed from before the heavy imports below
+from app.core.startup import StartupTimer
+
+startup_timer = StartupTimer()
+
+import logging
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import auth, users, projects, tasks, time_entries
+from fastapi.responses import JSONResponse
+from app.api.endpoints import auth, users, projects, tasks, time_entries, exports, internal, metrics, search, dashboard, invoices, health
+from app.core.config import settings
+from app.core.hashing import PasswordHasherBusy, password_hasher
+from app.core.log import (
+    REQUEST_ID_HEADER,
+    RequestIdMiddleware,
+    configure_logging,
+    shutdown_logging,
+)
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.replicas import replica_set
+from app.db.session import async_engine, engine
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="FreelanceFlow API")
 
@@ -11,15 +33,77 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing", "ETag", REQUEST_ID_HEADER],
 )
 
+# Request latency and per-request SQL metrics, wrapping every other
+# middleware but the request id one
+if settings.METRICS_ENABLED:
+    instrument_engine(async_engine.sync_engine)
+    instrument_engine(engine)
+    for replica in replica_set.replicas:
+        instrument_engine(replica.engine.sync_engine)
+    app.add_middleware(
+        MetricsMiddleware,
+        sample_rate=settings.METRICS_SAMPLE_RATE,
+        server_timing=settings.METRICS_SERVER_TIMING,
+    )
+
+# Outermost, so every log line of the request carries its id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 app.include_router(projects.router, prefix="/api")
 app.include_router(tasks.router, prefix="/api")
 app.include_router(time_entries.router, prefix="/api")
+app.include_router(exports.router, prefix="/api")
+app.include_router(internal.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(dashboard.router, prefix="/api")
+app.include_router(invoices.router, prefix="/api")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+app.include_router(health.router)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # Shed load rather than queue: the client should back off and retry
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Server is busy, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.on_event("startup")
+async def start_replica_checks():
+    await replica_set.start()
+
+@app.on_event("startup")
+async def record_startup_time():
+    startup_timer.mark("ready")
+    app.state.startup = startup_timer.snapshot()
+    logger.info("Application ready", extra=app.state.startup)
+
+@app.on_event("shutdown")
+async def close_database_pools():
+    # In-flight requests have drained by now; close pooled connections
+    # cleanly instead of leaving the database to time them out
+    await replica_set.close()
+    await async_engine.dispose()
+    engine.dispose()
+
+@app.on_event("shutdown")
+async def shutdown_password_hasher():
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def flush_logs():
+    shutdown_logging()
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to FreelanceFlow API"}
\ No newline at end of file
+    return {"message": "Welcome to FreelanceFlow API"}
+
+startup_timer.mark("app_import")
@@ -3,4 +3,8 @@ from app.models.user import User
 from app.models.role import Role
 from app.models.project import Project
 from app.models.task import Task
-from app.models.time_entry import TimeEntry 
\ No newline at end of file
+from app.models.time_entry import TimeEntry
+from app.models.time_rollup import TimeRollup
+from app.models.invoice import Invoice, InvoiceLineItem
+from app.models import triggers
+from app.models import search_index
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Numeric, Float, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.models.base import Base
+
+class InvoiceStatus(str, enum.Enum):
+    DRAFT = "draft"
+    ISSUED = "issued"
+    PAID = "paid"
+    VOID = "void"
+
+class Invoice(Base):
+    """Billable time of one client over one period, frozen at generation."""
+    __tablename__ = "invoices"
+    __table_args__ = (
+        # One invoice per client and period; also serves listing by user
+        UniqueConstraint("user_id", "client_name", "period_start", "period_end",
+                         name="uq_invoices_user_id_client_name_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    client_name = Column(String, nullable=False)
+    # Half-open [period_start, period_end), naive UTC, by entry start_time
+    period_start = Column(DateTime, nullable=False)
+    period_end = Column(DateTime, nullable=False)
+    status = Column(Enum(InvoiceStatus), nullable=False, default=InvoiceStatus.DRAFT)
+    hourly_rate = Column(Numeric(12, 2), nullable=False)
+    total_hours = Column(Numeric(12, 2), nullable=False)
+    total_amount = Column(Numeric(14, 2), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    line_items = relationship(
+        "InvoiceLineItem",
+        back_populates="invoice",
+        cascade="all, delete-orphan",
+        order_by="InvoiceLineItem.id"
+    )
+
+class InvoiceLineItem(Base):
+    """Per-project snapshot; names and figures are copied, not referenced."""
+    __tablename__ = "invoice_line_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    invoice_id = Column(Integer, ForeignKey("invoices.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="SET NULL"))
+    description = Column(String, nullable=False)
+    hours = Column(Float, nullable=False)  # Exact logged hours
+    billed_hours = Column(Numeric(12, 2), nullable=False)  # After rounding
+    rate = Column(Numeric(12, 2), nullable=False)
+    amount = Column(Numeric(14, 2), nullable=False)
+    entry_count = Column(Integer, nullable=False)
+
+    invoice = relationship("Invoice", back_populates="line_items")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -13,6 +13,11 @@ class ProjectStatus(str, enum.Enum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Keyset pagination of a user's projects, optionally by status
+        Index("ix_projects_user_id_id", "user_id", "id"),
+        Index("ix_projects_user_id_status_id", "user_id", "status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -25,5 +30,8 @@ class Project(Base):
     budget = Column(Float)
     total_tasks = Column(Integer, default=0)
     completed_tasks = Column(Integer, default=0)
+    # Bumped by every UPDATE, including the task counter triggers; feeds ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     user = relationship("User", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan") 
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Full-text search structures for projects, tasks and time entries.
+
+PostgreSQL keeps a stored ``search_vector`` tsvector column, generated
+from the searchable text, on each of the three tables and indexes it with
+GIN. Being generated, it is current after any write path, bulk statements
+included. The columns are not mapped on the models so ORM queries never
+load them, and they are added here at table creation or by the Alembic
+migration.
+
+SQLite, used for local runs, has a single FTS5 table ``search_index``
+kept current by triggers. Its rowid encodes the source row as
+``id * 4 + kind``, so a trigger can replace an entry by rowid.
+"""
+from sqlalchemy import DDL, event
+from app.models.project import Project
+from app.models.task import Task
+from app.models.time_entry import TimeEntry
+
+# 'simple' lowercases without stemming; the data is not all in one language
+TEXT_SEARCH_CONFIG = "simple"
+
+# Searchable columns per table, with their tsvector weights
+SEARCH_WEIGHTS = {
+    "projects": [("name", "A"), ("client_name", "B"), ("description", "C")],
+    "tasks": [("title", "A"), ("description", "C")],
+    "time_entries": [("description", "C")],
+}
+
+# Kind codes in the low bits of search_index rowids
+SQLITE_KIND_CODES = {"projects": 1, "tasks": 2, "time_entries": 3}
+
+
+def search_vector_expression(table_name: str) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in SEARCH_WEIGHTS[table_name]
+    )
+
+
+def _postgresql_statements(table_name: str) -> list:
+    return [
+        f"ALTER TABLE {table_name} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({search_vector_expression(table_name)}) STORED",
+        f"CREATE INDEX ix_{table_name}_search_vector ON {table_name} USING gin (search_vector)",
+    ]
+
+
+# title and body columns of search_index, as expressions over NEW
+SQLITE_DOCUMENTS = {
+    "projects": ("coalesce(NEW.name, '')",
+                 "trim(coalesce(NEW.client_name, '') || ' ' || coalesce(NEW.description, ''))"),
+    "tasks": ("coalesce(NEW.title, '')", "coalesce(NEW.description, '')"),
+    "time_entries": ("''", "coalesce(NEW.description, '')"),
+}
+
+SQLITE_SEARCH_TABLE = """
+CREATE VIRTUAL TABLE search_index USING fts5(
+    title, body, user_id UNINDEXED, tokenize = 'unicode61'
+)
+"""
+
+
+def _sqlite_triggers(table_name: str) -> list:
+    code = SQLITE_KIND_CODES[table_name]
+    title, body = SQLITE_DOCUMENTS[table_name]
+    columns = ", ".join(["user_id"] + [column for column, _ in SEARCH_WEIGHTS[table_name]])
+    index_new = (
+        f"INSERT INTO search_index (rowid, title, body, user_id) "
+        f"VALUES (NEW.id * 4 + {code}, {title}, {body}, NEW.user_id);"
+    )
+    return [
+        f"""
+        CREATE TRIGGER {table_name}_search_insert AFTER INSERT ON {table_name}
+        BEGIN
+            {index_new}
+        END
+        """,
+        # Counter and version bumps do not touch these columns, so they
+        # leave the index alone
+        f"""
+        CREATE TRIGGER {table_name}_search_update AFTER UPDATE OF {columns} ON {table_name}
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 4 + {code};
+            {index_new}
+        END
+        """,
+        f"""
+        CREATE TRIGGER {table_name}_search_delete AFTER DELETE ON {table_name}
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * 4 + {code};
+        END
+        """,
+    ]
+
+
+for model in (Project, Task, TimeEntry):
+    for statement in _postgresql_statements(model.__tablename__):
+        event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+# time_entries is created after projects and tasks, so the shared FTS
+# table and all its triggers hang off it
+sqlite_statements = [SQLITE_SEARCH_TABLE]
+for model in (Project, Task, TimeEntry):
+    sqlite_statements += _sqlite_triggers(model.__tablename__)
+for statement in sqlite_statements:
+    event.listen(TimeEntry.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    TimeEntry.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS search_index").execute_if(dialect="sqlite")
+)
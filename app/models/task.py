@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Float, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -18,6 +18,12 @@ class TaskPriority(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination of a user's tasks, optionally by status or priority
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+        Index("ix_tasks_user_id_priority_created_at_id", "user_id", "priority", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -30,6 +36,8 @@ class Task(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     due_time = Column(DateTime)
     estimated_hours = Column(Float)
+    # Bumped by every UPDATE; feeds ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
 
     # Relationships
     project = relationship("Project", back_populates="tasks")
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.base import Base
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
+    __table_args__ = (
+        # Keyset pagination of a task's entries in start_time order
+        Index("ix_time_entries_task_id_user_id_start_time_id", "task_id", "user_id", "start_time", "id"),
+        # Per-user time statistics over a start_time range
+        Index("ix_time_entries_user_id_start_time", "user_id", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"))
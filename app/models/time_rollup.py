@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Date, Float, ForeignKey, Index
+from app.models.base import Base
+
+class TimeRollup(Base):
+    """Per (user, task, UTC day) totals of time entries, kept current on write."""
+    __tablename__ = "time_rollups"
+    __table_args__ = (
+        Index("ix_time_rollups_user_id_day", "user_id", "day"),
+        Index("ix_time_rollups_project_id_day", "project_id", "day"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"))
+    total_hours = Column(Float, nullable=False, default=0.0)
+    billable_hours = Column(Float, nullable=False, default=0.0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    billable_count = Column(Integer, nullable=False, default=0)
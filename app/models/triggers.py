@@ -0,0 +1,211 @@
+"""Database triggers keeping denormalized counters current.
+
+Every insert, delete and status/project change on ``tasks`` adjusts the
+owning project's counters in the same statement, whichever code path
+wrote the rows, and bumps the project's version and updated_at since its
+representation changed. PostgreSQL uses statement-level triggers over
+transition tables, so a bulk statement touches each project once; SQLite,
+used for local runs, uses row-level triggers. The DDL is attached to table
+creation here and shipped to existing databases by an Alembic migration.
+
+Changes to ``user_role``, and renames of a role, bump ``users.role_version``
+so access tokens carrying the previous role claims stop being accepted.
+"""
+from sqlalchemy import DDL, event
+from app.models.task import Task, TaskStatus
+from app.models.user import user_role
+
+COMPLETED = TaskStatus.COMPLETED.name
+# Naive UTC, like the datetime.utcnow column defaults
+PG_NOW = "(now() AT TIME ZONE 'UTC')"
+# (DDL statements are %-formatted, hence the doubled signs)
+SQLITE_NOW = "strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now')"
+
+POSTGRESQL_COUNTER_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION tasks_project_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed,
+            version = p.version + 1,
+            updated_at = {PG_NOW}
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = '{COMPLETED}') AS completed
+            FROM new_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) - d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) - d.completed,
+            version = p.version + 1,
+            updated_at = {PG_NOW}
+        FROM (
+            SELECT project_id, count(*) AS total,
+                   count(*) FILTER (WHERE status = '{COMPLETED}') AS completed
+            FROM old_rows WHERE project_id IS NOT NULL GROUP BY project_id
+        ) d
+        WHERE p.id = d.project_id;
+    ELSE
+        UPDATE projects p
+        SET total_tasks = coalesce(p.total_tasks, 0) + d.total,
+            completed_tasks = coalesce(p.completed_tasks, 0) + d.completed,
+            version = p.version + 1,
+            updated_at = {PG_NOW}
+        FROM (
+            SELECT project_id, sum(total) AS total, sum(completed) AS completed
+            FROM (
+                SELECT project_id, 1 AS total,
+                       CASE WHEN status = '{COMPLETED}' THEN 1 ELSE 0 END AS completed
+                FROM new_rows
+                UNION ALL
+                SELECT project_id, -1,
+                       CASE WHEN status = '{COMPLETED}' THEN -1 ELSE 0 END
+                FROM old_rows
+            ) changes
+            WHERE project_id IS NOT NULL
+            GROUP BY project_id
+            HAVING sum(total) <> 0 OR sum(completed) <> 0
+        ) d
+        WHERE p.id = d.project_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+POSTGRESQL_COUNTER_TRIGGERS = [
+    "CREATE TRIGGER tasks_project_counters_insert AFTER INSERT ON tasks "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION tasks_project_counters()",
+    "CREATE TRIGGER tasks_project_counters_delete AFTER DELETE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION tasks_project_counters()",
+    "CREATE TRIGGER tasks_project_counters_update AFTER UPDATE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION tasks_project_counters()",
+]
+
+SQLITE_COUNTER_TRIGGERS = [
+    f"""
+    CREATE TRIGGER tasks_project_counters_insert AFTER INSERT ON tasks
+    WHEN NEW.project_id IS NOT NULL
+    BEGIN
+        UPDATE projects
+        SET total_tasks = coalesce(total_tasks, 0) + 1,
+            completed_tasks = coalesce(completed_tasks, 0) + (NEW.status = '{COMPLETED}'),
+            version = version + 1,
+            updated_at = {SQLITE_NOW}
+        WHERE id = NEW.project_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_project_counters_delete AFTER DELETE ON tasks
+    WHEN OLD.project_id IS NOT NULL
+    BEGIN
+        UPDATE projects
+        SET total_tasks = coalesce(total_tasks, 0) - 1,
+            completed_tasks = coalesce(completed_tasks, 0) - (OLD.status = '{COMPLETED}'),
+            version = version + 1,
+            updated_at = {SQLITE_NOW}
+        WHERE id = OLD.project_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_project_counters_update AFTER UPDATE OF status, project_id ON tasks
+    WHEN OLD.status IS NOT NEW.status OR OLD.project_id IS NOT NEW.project_id
+    BEGIN
+        UPDATE projects
+        SET total_tasks = coalesce(total_tasks, 0) - 1,
+            completed_tasks = coalesce(completed_tasks, 0) - (OLD.status = '{COMPLETED}'),
+            version = version + 1,
+            updated_at = {SQLITE_NOW}
+        WHERE id = OLD.project_id;
+        UPDATE projects
+        SET total_tasks = coalesce(total_tasks, 0) + 1,
+            completed_tasks = coalesce(completed_tasks, 0) + (NEW.status = '{COMPLETED}'),
+            version = version + 1,
+            updated_at = {SQLITE_NOW}
+        WHERE id = NEW.project_id;
+    END
+    """,
+]
+
+POSTGRESQL_ROLE_VERSION_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION user_role_version() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE users SET role_version = role_version + 1 WHERE id = OLD.user_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE users SET role_version = role_version + 1 WHERE id = NEW.user_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION roles_rename_version() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE users SET role_version = role_version + 1
+        WHERE id IN (SELECT user_id FROM user_role WHERE role_id = NEW.id);
+        RETURN NULL;
+    END
+    $$
+    """,
+]
+
+# Role grants are rare, so row-level triggers are enough here
+POSTGRESQL_ROLE_VERSION_TRIGGERS = [
+    "CREATE TRIGGER user_role_version AFTER INSERT OR UPDATE OR DELETE ON user_role "
+    "FOR EACH ROW EXECUTE FUNCTION user_role_version()",
+    "CREATE TRIGGER roles_rename_version AFTER UPDATE OF name ON roles "
+    "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name) "
+    "EXECUTE FUNCTION roles_rename_version()",
+]
+
+SQLITE_ROLE_VERSION_TRIGGERS = [
+    """
+    CREATE TRIGGER user_role_version_insert AFTER INSERT ON user_role
+    BEGIN
+        UPDATE users SET role_version = role_version + 1 WHERE id = NEW.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER user_role_version_delete AFTER DELETE ON user_role
+    BEGIN
+        UPDATE users SET role_version = role_version + 1 WHERE id = OLD.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER user_role_version_update AFTER UPDATE ON user_role
+    BEGIN
+        UPDATE users SET role_version = role_version + 1
+        WHERE id IN (OLD.user_id, NEW.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER roles_rename_version AFTER UPDATE OF name ON roles
+    WHEN OLD.name IS NOT NEW.name
+    BEGIN
+        UPDATE users SET role_version = role_version + 1
+        WHERE id IN (SELECT user_id FROM user_role WHERE role_id = NEW.id);
+    END
+    """,
+]
+
+for statement in [POSTGRESQL_COUNTER_FUNCTION] + POSTGRESQL_COUNTER_TRIGGERS:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_COUNTER_TRIGGERS:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+# user_role is created after both users and roles, so it carries all of them
+for statement in POSTGRESQL_ROLE_VERSION_FUNCTIONS + POSTGRESQL_ROLE_VERSION_TRIGGERS:
+    event.listen(user_role, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_ROLE_VERSION_TRIGGERS:
+    event.listen(user_role, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -29,6 +29,8 @@ class User(Base):
     access_token = Column(String)
     token_expires = Column(DateTime)
     verification_token = Column(String)
+    # Bumped by triggers on user_role; access tokens embed it with the roles
+    role_version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     roles = relationship("Role", secondary=user_role, back_populates="users")
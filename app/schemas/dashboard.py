@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from app.models.project import ProjectStatus
+from app.models.task import TaskPriority, TaskStatus
+
+class DashboardProject(BaseModel):
+    id: int
+    name: str
+    status: Optional[ProjectStatus] = None
+    total_tasks: int
+    completed_tasks: int
+    progress: float
+    hours_this_week: float
+    billable_hours_this_week: float
+    billable_value_this_week: float
+
+class DashboardTask(BaseModel):
+    id: int
+    project_id: Optional[int] = None
+    title: str
+    status: TaskStatus
+    priority: TaskPriority
+    due_time: datetime
+
+class Dashboard(BaseModel):
+    generated_at: datetime
+    week_start: datetime
+    hourly_rate: float
+    hours_this_week: float
+    billable_hours_this_week: float
+    billable_value_this_week: float
+    projects: List[DashboardProject]
+    overdue_tasks: List[DashboardTask]
+    due_soon_tasks: List[DashboardTask]
@@ -0,0 +1,61 @@
+from pydantic import BaseModel, model_validator
+from typing import List, Optional
+from datetime import datetime
+from app.models.invoice import InvoiceStatus
+
+class InvoicePeriod(BaseModel):
+    """Half-open [period_start, period_end) over entry start times, in UTC."""
+    period_start: datetime
+    period_end: datetime
+
+    @model_validator(mode="after")
+    def check_period(self):
+        if self.period_end <= self.period_start:
+            raise ValueError("period_end must be after period_start")
+        return self
+
+class InvoiceCreate(InvoicePeriod):
+    client_name: str
+
+class InvoiceLineItemBase(BaseModel):
+    project_id: Optional[int] = None
+    description: str
+    hours: float
+    billed_hours: float
+    rate: float
+    amount: float
+    entry_count: int
+
+class InvoiceLineItem(InvoiceLineItemBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class InvoicePreview(InvoicePeriod):
+    client_name: str
+    hourly_rate: float
+    total_hours: float
+    total_amount: float
+    line_items: List[InvoiceLineItemBase]
+
+class InvoiceSummary(InvoicePeriod):
+    id: int
+    user_id: int
+    client_name: str
+    status: InvoiceStatus
+    hourly_rate: float
+    total_hours: float
+    total_amount: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class Invoice(InvoiceSummary):
+    line_items: List[InvoiceLineItem]
+
+class InvoiceBatchResult(BaseModel):
+    created: int
+    skipped: int
+    ids: List[int]
@@ -23,6 +23,8 @@ class Project(ProjectBase):
     user_id: int
     total_tasks: int
     completed_tasks: int
+    version: int
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True 
\ No newline at end of file
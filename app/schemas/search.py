@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+import enum
+
+class SearchKind(str, enum.Enum):
+    PROJECT = "project"
+    TASK = "task"
+    TIME_ENTRY = "time_entry"
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: int
+    title: Optional[str] = None
+    snippet: Optional[str] = None
+    rank: float
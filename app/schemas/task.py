@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
 from app.models.task import TaskStatus, TaskPriority
 
@@ -23,6 +23,48 @@ class Task(TaskBase):
     user_id: int
     created_at: datetime
     updated_at: datetime
+    version: int
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+# Upper bound on the tasks one bulk request may create or name by id
+MAX_BULK_TASKS = 1000
+
+class TaskBulkCreate(BaseModel):
+    project_id: int
+    tasks: List[TaskBase] = Field(..., min_length=1, max_length=MAX_BULK_TASKS)
+
+class TaskFilter(BaseModel):
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    project_id: Optional[int] = None
+    due_from: Optional[datetime] = None
+    due_to: Optional[datetime] = None
+
+class TaskSelection(BaseModel):
+    """Either explicit task ``ids`` or a ``filter`` over the caller's tasks."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BULK_TASKS)
+    filter: Optional[TaskFilter] = None
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Give exactly one of ids or filter")
+        return self
+
+class TaskBulkUpdate(TaskSelection):
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if self.status is None and self.priority is None:
+            raise ValueError("Give status, priority or both")
+        return self
+
+class TaskBulkResult(BaseModel):
+    count: int
+    ids: List[int]
+    # Requested ids that do not exist or belong to someone else
+    not_found: List[int] = []
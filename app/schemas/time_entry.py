@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional, Union
 from datetime import datetime
+import enum
 
 class TimeEntryBase(BaseModel):
     start_time: datetime
@@ -15,10 +16,48 @@ class TimeEntryCreate(TimeEntryBase):
 class TimeEntryUpdate(TimeEntryBase):
     pass
 
+class TimeEntryImportRow(TimeEntryCreate):
+    task_id: int
+
 class TimeEntry(TimeEntryBase):
     id: int
     task_id: int
     user_id: int
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class TimeGrouping(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    PROJECT = "project"
+    TASK = "task"
+    BILLABLE = "billable"
+
+class TimeStatisticsBucket(BaseModel):
+    key: Union[bool, int, str, None]
+    total_time: float
+    billable_time: float
+    number_of_entries: int
+
+class TimeStatistics(BaseModel):
+    total_time: float
+    billable_time: float
+    number_of_entries: int
+    group_by: Optional[TimeGrouping] = None
+    timezone: Optional[str] = None
+    buckets: Optional[List[TimeStatisticsBucket]] = None
+
+class BulkFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class BulkRowError(BaseModel):
+    row: int
+    error: str
+
+class TimeEntryBulkResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkRowError]
@@ -0,0 +1,129 @@
+"""Production entry point: ``python -m app.server``.
+
+Runs uvicorn with the SERVER_* settings. These cover the worker count,
+the uvloop/httptools fast paths when installed, listen backlog,
+keep-alive and graceful drain. On SIGTERM uvicorn stops accepting
+connections and gives in-flight requests SERVER_GRACEFUL_SHUTDOWN_SECONDS
+to finish before the shutdown handlers close the database pools.
+
+Tokens are signed with SECRET_KEY, so several workers must share one.
+Without an explicit key every worker would invent its own and reject
+the others' tokens, so the launcher refuses to start.
+
+The "memory" result cache backend is per process: a write invalidates
+only its own worker's entries, and the others would keep serving the
+old results. With several workers the launcher turns that cache off.
+
+``--profile-imports`` prints the slowest imports of ``app.main``, the
+main cost of a cold start.
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import subprocess
+import sys
+import uvicorn
+from app.core.config import settings
+from app.core.log import configure_logging
+
+logger = logging.getLogger("app.server")
+
+def resolve_workers(workers: int) -> int:
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+def check_secret_key(workers: int) -> None:
+    if "SECRET_KEY" in settings.model_fields_set:
+        return
+    if workers > 1:
+        sys.exit(
+            "SECRET_KEY must be set when running more than one worker; "
+            "each worker would otherwise sign tokens with its own random key"
+        )
+    logger.warning("SECRET_KEY is not set; issued tokens will not survive a restart")
+
+def check_result_cache(workers: int) -> None:
+    if workers > 1 and settings.RESULT_CACHE_ENABLED and settings.RESULT_CACHE_BACKEND == "memory":
+        logger.warning(
+            "Result cache disabled: the memory backend cannot invalidate across %d workers; "
+            "set RESULT_CACHE_BACKEND to a shared backend to keep it", workers
+        )
+        # Workers build their settings from the environment they inherit
+        os.environ["RESULT_CACHE_ENABLED"] = "false"
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def resolve_loop(choice: str) -> str:
+    if choice != "auto":
+        return choice
+    return "uvloop" if _installed("uvloop") else "asyncio"
+
+def resolve_http(choice: str) -> str:
+    if choice != "auto":
+        return choice
+    return "httptools" if _installed("httptools") else "h11"
+
+def profile_imports(limit: int) -> None:
+    """Run ``python -X importtime`` on app.main and list the costliest modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self [us] | cumulative | imported package"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings.append((int(cumulative_us), int(self_us), name.strip()))
+    total = max((timing[0] for timing in timings if timing[2] == "app.main"), default=0)
+    print(f"import app.main: {total / 1e6:.3f}s")
+    print(f"{'cumulative':>12}{'self':>10}  module")
+    for cumulative_us, self_us, name in sorted(timings, reverse=True)[:limit]:
+        print(f"{cumulative_us / 1e6:>11.3f}s{self_us / 1e6:>9.3f}s  {name}")
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.server")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS,
+                        help="Worker processes; 0 means one per CPU")
+    parser.add_argument("--profile-imports", type=int, metavar="N", default=None,
+                        help="Print the N slowest imports of app.main and exit")
+    args = parser.parse_args(argv)
+
+    if args.profile_imports is not None:
+        profile_imports(args.profile_imports)
+        return
+
+    configure_logging()
+    workers = resolve_workers(args.workers)
+    check_secret_key(workers)
+    check_result_cache(workers)
+    loop = resolve_loop(settings.SERVER_LOOP)
+    http = resolve_http(settings.SERVER_HTTP)
+    logger.info(
+        "Starting %d worker(s) on %s:%d with %s loop and %s parser",
+        workers, args.host, args.port, loop, http
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+        proxy_headers=settings.SERVER_PROXY_HEADERS,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        access_log=settings.SERVER_ACCESS_LOG,
+        # Leave logging to app.core.log so uvicorn's records go out as JSON too
+        log_config=None,
+    )
+
+if __name__ == "__main__":
+    main()
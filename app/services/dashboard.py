@@ -0,0 +1,133 @@
+"""The current user's dashboard, in three set-based queries.
+
+1. This week's hours per project, from ``compute_time_statistics`` (the
+   daily rollups when they are enabled, since the week starts on a UTC
+   day boundary).
+2. Open projects with their task counters, plus any project that had
+   time logged this week.
+3. Overdue and due-soon unfinished tasks, each list capped at
+   DASHBOARD_TASK_LIMIT, as one UNION ALL.
+
+The query count does not depend on how many projects or tasks the user
+has. Results are kept in the result cache for DASHBOARD_CACHE_TTL_SECONDS,
+tagged with every resource of the user, so any write to the user's
+projects, tasks, time entries or profile drops them.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.result_cache import ALL_RESOURCES, result_cache, result_key, user_tags
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskStatus
+from app.schemas.time_entry import TimeGrouping
+from app.services.time_stats import compute_time_statistics
+
+CLOSED_PROJECT_STATUSES = (ProjectStatus.COMPLETED, ProjectStatus.CANCELLED)
+
+TASK_COLUMNS = [Task.id, Task.project_id, Task.title, Task.status, Task.priority, Task.due_time]
+
+def week_start(now: datetime) -> datetime:
+    """Monday 00:00 UTC of the week containing naive-UTC ``now``."""
+    return datetime.combine(now.date() - timedelta(days=now.weekday()), datetime.min.time())
+
+def _money(value: float) -> float:
+    return round(value, 2)
+
+async def _hours_by_project(db: AsyncSession, user_id: int, since: datetime) -> dict:
+    statistics = await compute_time_statistics(
+        db, user_id, start_date=since, group_by=TimeGrouping.PROJECT
+    )
+    return {bucket["key"]: bucket for bucket in statistics["buckets"]}
+
+async def _projects(db: AsyncSession, user_id: int, logged_project_ids) -> list:
+    result = await db.execute(
+        select(
+            Project.id,
+            Project.name,
+            Project.status,
+            Project.total_tasks,
+            Project.completed_tasks,
+        ).where(
+            Project.user_id == user_id,
+            or_(
+                Project.status.is_(None),
+                Project.status.notin_(CLOSED_PROJECT_STATUSES),
+                Project.id.in_(list(logged_project_ids)),
+            )
+        ).order_by(Project.id)
+    )
+    return result.all()
+
+async def _upcoming_tasks(db: AsyncSession, user_id: int, now: datetime) -> tuple:
+    open_tasks = [
+        Task.user_id == user_id,
+        Task.status != TaskStatus.COMPLETED,
+        Task.due_time.is_not(None),
+    ]
+    limit = settings.DASHBOARD_TASK_LIMIT
+    overdue = (
+        select(*TASK_COLUMNS).where(*open_tasks, Task.due_time < now)
+        .order_by(Task.due_time, Task.id).limit(limit).subquery()
+    )
+    due_soon = (
+        select(*TASK_COLUMNS).where(
+            *open_tasks,
+            Task.due_time >= now,
+            Task.due_time < now + timedelta(days=settings.DASHBOARD_DUE_SOON_DAYS)
+        ).order_by(Task.due_time, Task.id).limit(limit).subquery()
+    )
+    rows = (await db.execute(union_all(select(overdue), select(due_soon)))).all()
+    rows.sort(key=lambda row: (row.due_time, row.id))
+    return (
+        [row._asdict() for row in rows if row.due_time < now],
+        [row._asdict() for row in rows if row.due_time >= now],
+    )
+
+async def build_dashboard(db: AsyncSession, user) -> dict:
+    now = datetime.utcnow()
+    since = week_start(now)
+    rate = user.hourly_rate or 0.0
+
+    hours = await _hours_by_project(db, user.id, since)
+    projects = []
+    for row in await _projects(db, user.id, [key for key in hours if key is not None]):
+        logged = hours.get(row.id)
+        total_hours = logged["total_time"] if logged else 0.0
+        billable_hours = logged["billable_time"] if logged else 0.0
+        total_tasks = row.total_tasks or 0
+        completed_tasks = row.completed_tasks or 0
+        projects.append({
+            "id": row.id,
+            "name": row.name,
+            "status": row.status,
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+            "progress": completed_tasks / total_tasks if total_tasks else 0.0,
+            "hours_this_week": total_hours,
+            "billable_hours_this_week": billable_hours,
+            "billable_value_this_week": _money(billable_hours * rate),
+        })
+    overdue, due_soon = await _upcoming_tasks(db, user.id, now)
+
+    # Totals include time on tasks without a project
+    billable_hours = sum(bucket["billable_time"] for bucket in hours.values())
+    return {
+        "generated_at": now,
+        "week_start": since,
+        "hourly_rate": rate,
+        "hours_this_week": sum(bucket["total_time"] for bucket in hours.values()),
+        "billable_hours_this_week": billable_hours,
+        "billable_value_this_week": _money(billable_hours * rate),
+        "projects": projects,
+        "overdue_tasks": overdue,
+        "due_soon_tasks": due_soon,
+    }
+
+async def get_dashboard(db: AsyncSession, user) -> dict:
+    return await result_cache.get_or_compute(
+        result_key("dashboard", user.id),
+        user_tags(user.id, *ALL_RESOURCES),
+        lambda: build_dashboard(db, user),
+        ttl=settings.DASHBOARD_CACHE_TTL_SECONDS
+    )
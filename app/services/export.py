@@ -0,0 +1,57 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Sequence
+from app.db.base import AsyncSessionLocal
+from app.schemas.time_entry import BulkFormat
+
+MEDIA_TYPES = {
+    BulkFormat.NDJSON: "application/x-ndjson",
+    BulkFormat.CSV: "text/csv",
+}
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _csv_cell(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return _plain(value)
+
+async def stream_query(
+    query,
+    columns: Sequence[str],
+    fmt: BulkFormat,
+    batch_size: int = 1000
+) -> AsyncIterator[str]:
+    """Stream the rows of ``query`` as NDJSON or CSV text.
+
+    The query runs on its own session so it outlives the request's
+    dependencies, and rows are pulled through a server-side cursor
+    ``batch_size`` at a time, keeping memory flat for any result size.
+    """
+    if fmt is BulkFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            if fmt is BulkFormat.CSV:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_csv_cell(value) for value in row] for row in rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(columns, map(_plain, row)))) + "\n"
+                    for row in rows
+                )
@@ -0,0 +1,169 @@
+import codecs
+import csv
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.task import Task
+from app.models.time_entry import TimeEntry
+from app.schemas.time_entry import BulkFormat, TimeEntryImportRow
+from app.services import rollups
+
+COLUMNS = ("task_id", "user_id", "start_time", "end_time", "duration", "description", "is_billable")
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into text lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+async def iter_records(lines: AsyncIterator[str], fmt: BulkFormat):
+    """Yield ``(row_number, data, error)`` for each non-blank input record.
+
+    CSV input needs a header row and one record per line.
+    """
+    header = None
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt is BulkFormat.CSV:
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            row_number += 1
+            if len(values) != len(header):
+                yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            # Empty cells fall back to the schema defaults
+            yield row_number, {k: v for k, v in zip(header, values) if v != ""}, None
+        else:
+            row_number += 1
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield row_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "Expected a JSON object"
+                continue
+            yield row_number, data, None
+
+def _utc_naive(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+class TimeEntryIngester:
+    """Validates streamed rows and writes them in chunks in one transaction.
+
+    Rows go in as multi-row INSERTs, or through COPY when the session
+    runs on asyncpg. The caller commits.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: int, chunk_size: int, max_errors: int):
+        self.db = db
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+        self._batch = []
+        self._task_projects = {}
+        self._missing_tasks = set()
+        self._use_copy = db.get_bind().dialect.driver == "asyncpg"
+
+    async def add(self, row_number: int, data: Optional[dict], error: Optional[str]) -> None:
+        if error is None:
+            try:
+                item = TimeEntryImportRow(**data)
+            except ValidationError as e:
+                error = _describe(e)
+        if error is not None:
+            self._fail(row_number, error)
+            return
+        self._batch.append((row_number, item))
+        if len(self._batch) >= self.chunk_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        await self._load_tasks({item.task_id for _, item in batch})
+
+        rows = []
+        for row_number, item in batch:
+            if item.task_id not in self._task_projects:
+                self._fail(row_number, "Task not found")
+                continue
+            rows.append({
+                "task_id": item.task_id,
+                "user_id": self.user_id,
+                "start_time": _utc_naive(item.start_time),
+                "end_time": _utc_naive(item.end_time),
+                "duration": item.duration,
+                "description": item.description,
+                "is_billable": item.is_billable,
+            })
+        if not rows:
+            return
+
+        if self._use_copy:
+            await self._copy(rows)
+        else:
+            await self.db.execute(insert(TimeEntry), rows)
+        await rollups.add_to_rollups(self.db, [
+            dict(row, project_id=self._task_projects[row["task_id"]]) for row in rows
+        ])
+        self.inserted += len(rows)
+
+    def result(self) -> dict:
+        errors = sorted(self.errors, key=lambda error: error["row"])
+        return {"inserted": self.inserted, "failed": self.failed, "errors": errors}
+
+    def _fail(self, row_number: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "error": error})
+
+    async def _load_tasks(self, task_ids: set) -> None:
+        unknown = task_ids - self._task_projects.keys() - self._missing_tasks
+        if not unknown:
+            return
+        result = await self.db.execute(
+            select(Task.id, Task.project_id).where(
+                Task.id.in_(unknown),
+                Task.user_id == self.user_id
+            )
+        )
+        for task_id, project_id in result:
+            self._task_projects[task_id] = project_id
+        self._missing_tasks |= unknown - self._task_projects.keys()
+
+    async def _copy(self, rows: list) -> None:
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            TimeEntry.__tablename__,
+            columns=COLUMNS,
+            records=[tuple(row[column] for column in COLUMNS) for row in rows],
+        )
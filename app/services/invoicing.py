@@ -0,0 +1,188 @@
+"""Invoice computation over billable time.
+
+Billable hours are summed in the database, grouped by user, client
+(``Project.client_name``) and project, over a half-open period of entry
+start times. Day-aligned periods such as months read the daily rollups;
+others scan time_entries. Python then rounds the handful of resulting
+rows: each line's hours to INVOICE_HOURS_INCREMENT, amounts to cents
+half up. The invoice total is the sum of its rounded lines, and a client
+whose hours all round to zero gets no invoice.
+
+Generated invoices store their line items with project names, rates and
+amounts copied. Reading an invoice never rescans time entries, and later
+edits to projects, rates or entries leave it unchanged. Time on tasks
+without a project has no client and is not invoiced.
+"""
+from datetime import datetime
+from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
+from itertools import groupby
+from typing import Optional
+from sqlalchemy import func, insert, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.invoice import Invoice, InvoiceLineItem
+from app.models.project import Project
+from app.models.task import Task
+from app.models.time_entry import TimeEntry
+from app.models.time_rollup import TimeRollup
+from app.models.user import User
+from app.services.time_stats import can_use_rollups
+
+ROUNDING_MODES = {"half_up": ROUND_HALF_UP, "up": ROUND_CEILING, "down": ROUND_FLOOR}
+CENT = Decimal("0.01")
+# Float sums carry noise like 1.2000000000000002, which rounding "up"
+# would turn into a whole extra increment
+HOURS_PRECISION = Decimal("0.000001")
+
+def month_period(year: int, month: int) -> tuple:
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+def previous_month(now: datetime) -> tuple:
+    return (now.year, now.month - 1) if now.month > 1 else (now.year - 1, 12)
+
+def round_hours(hours: float) -> Decimal:
+    increment = Decimal(str(settings.INVOICE_HOURS_INCREMENT))
+    exact = Decimal(repr(hours)).quantize(HOURS_PRECISION, rounding=ROUND_HALF_EVEN)
+    units = (exact / increment).quantize(
+        Decimal(1), rounding=ROUNDING_MODES[settings.INVOICE_HOURS_ROUNDING]
+    )
+    return (units * increment).quantize(CENT)
+
+def money(value) -> Decimal:
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+def billable_query(
+    period_start: datetime,
+    period_end: datetime,
+    user_id: Optional[int] = None,
+    client_name: Optional[str] = None
+):
+    """Billable hours and entry counts per user, client and project."""
+    if can_use_rollups(period_start, period_end, None, "UTC"):
+        user_column = TimeRollup.user_id
+        hours = func.sum(TimeRollup.billable_hours)
+        entries = func.sum(TimeRollup.billable_count)
+        query = (
+            select(TimeRollup.user_id.label("user_id"))
+            .join(Project, Project.id == TimeRollup.project_id)
+            .where(
+                TimeRollup.day >= period_start.date(),
+                TimeRollup.day < period_end.date()
+            )
+        )
+    else:
+        user_column = TimeEntry.user_id
+        hours = func.sum(TimeEntry.duration)
+        entries = func.count(TimeEntry.id)
+        query = (
+            select(TimeEntry.user_id.label("user_id"))
+            .join(Task, Task.id == TimeEntry.task_id)
+            .join(Project, Project.id == Task.project_id)
+            .where(
+                TimeEntry.is_billable == true(),
+                TimeEntry.start_time >= period_start,
+                TimeEntry.start_time < period_end
+            )
+        )
+    query = query.join(User, User.id == user_column).add_columns(
+        User.hourly_rate,
+        Project.client_name,
+        Project.id.label("project_id"),
+        Project.name.label("project_name"),
+        func.coalesce(hours, 0.0).label("hours"),
+        entries.label("entry_count"),
+    ).where(Project.client_name.is_not(None))
+    if user_id is not None:
+        query = query.where(user_column == user_id)
+    if client_name is not None:
+        query = query.where(Project.client_name == client_name)
+    return (
+        query.group_by(user_column, User.hourly_rate, Project.client_name, Project.id, Project.name)
+        .having(entries > 0)
+        .order_by(user_column, Project.client_name, Project.id)
+    )
+
+def build_invoices(rows, period_start: datetime, period_end: datetime) -> list:
+    """Rounded invoice drafts, one per (user, client), from ``billable_query`` rows."""
+    drafts = []
+    for (user_id, client_name), lines in groupby(rows, key=lambda row: (row.user_id, row.client_name)):
+        lines = list(lines)
+        rate = money(lines[0].hourly_rate or 0)
+        line_items = []
+        for line in lines:
+            billed_hours = round_hours(line.hours)
+            line_items.append({
+                "project_id": line.project_id,
+                "description": line.project_name or f"Project {line.project_id}",
+                "hours": round(line.hours, 6),
+                "billed_hours": billed_hours,
+                "rate": rate,
+                "amount": money(billed_hours * rate),
+                "entry_count": line.entry_count,
+            })
+        total_hours = sum((item["billed_hours"] for item in line_items), Decimal(0))
+        if not total_hours:
+            # Everything rounded away; there is nothing to bill
+            continue
+        drafts.append({
+            "user_id": user_id,
+            "client_name": client_name,
+            "period_start": period_start,
+            "period_end": period_end,
+            "hourly_rate": rate,
+            "total_hours": total_hours,
+            "total_amount": sum((item["amount"] for item in line_items), Decimal(0)),
+            "line_items": line_items,
+        })
+    return drafts
+
+async def preview_invoices(
+    db: AsyncSession,
+    period_start: datetime,
+    period_end: datetime,
+    user_id: Optional[int] = None,
+    client_name: Optional[str] = None
+) -> list:
+    rows = (await db.execute(
+        billable_query(period_start, period_end, user_id, client_name)
+    )).all()
+    return build_invoices(rows, period_start, period_end)
+
+async def generate_invoices(
+    db: AsyncSession,
+    period_start: datetime,
+    period_end: datetime,
+    user_id: Optional[int] = None,
+    client_name: Optional[str] = None
+) -> dict:
+    """Store invoices for every matching client with billable time.
+
+    Clients already invoiced for exactly this period are skipped, so a
+    batch can be rerun safely. The caller commits.
+    """
+    drafts = await preview_invoices(db, period_start, period_end, user_id, client_name)
+    existing_query = select(Invoice.user_id, Invoice.client_name).where(
+        Invoice.period_start == period_start,
+        Invoice.period_end == period_end
+    )
+    if user_id is not None:
+        existing_query = existing_query.where(Invoice.user_id == user_id)
+    if client_name is not None:
+        existing_query = existing_query.where(Invoice.client_name == client_name)
+    existing = set((await db.execute(existing_query)).all())
+    new = [draft for draft in drafts if (draft["user_id"], draft["client_name"]) not in existing]
+
+    ids = []
+    if new:
+        ids = (await db.scalars(
+            insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+            [{key: value for key, value in draft.items() if key != "line_items"} for draft in new]
+        )).all()
+        await db.execute(insert(InvoiceLineItem), [
+            dict(item, invoice_id=invoice_id)
+            for invoice_id, draft in zip(ids, new)
+            for item in draft["line_items"]
+        ])
+    return {"created": len(ids), "skipped": len(drafts) - len(new), "ids": list(ids)}
@@ -0,0 +1,46 @@
+from sqlalchemy import func, select, update
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+
+def counter_subqueries():
+    """Correlated COUNTs of a project's tasks, as the triggers would keep them."""
+    total = select(func.count(Task.id)).where(
+        Task.project_id == Project.id
+    ).scalar_subquery()
+    completed = select(func.count(Task.id)).where(
+        Task.project_id == Project.id,
+        Task.status == TaskStatus.COMPLETED
+    ).scalar_subquery()
+    return total, completed
+
+def reconcile_project_counters(session, batch_size: int = 1000, log=print) -> int:
+    """Recount total_tasks/completed_tasks, ``batch_size`` project ids at a time.
+
+    Only drifted rows are written, and each batch commits on its own so
+    locks stay short. Runs on a sync session; returns the number of
+    projects repaired.
+    """
+    first_id, last_id = session.execute(
+        select(func.min(Project.id), func.max(Project.id))
+    ).one()
+    if first_id is None:
+        return 0
+    total, completed = counter_subqueries()
+    repaired = 0
+    for start in range(first_id, last_id + 1, batch_size):
+        end = min(start + batch_size - 1, last_id)
+        result = session.execute(
+            update(Project)
+            .where(
+                Project.id.between(start, end),
+                (Project.total_tasks.is_distinct_from(total))
+                | (Project.completed_tasks.is_distinct_from(completed))
+            )
+            .values(total_tasks=total, completed_tasks=completed)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        repaired += result.rowcount
+        if result.rowcount:
+            log(f"Repaired counters of {result.rowcount} projects in {start}..{end}")
+    return repaired
@@ -0,0 +1,171 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+from sqlalchemy import Date, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.task import Task
+from app.models.time_entry import TimeEntry
+from app.models.time_rollup import TimeRollup
+
+ROLLUP_KEY = ("user_id", "task_id", "day")
+ROLLUP_MEASURES = ("total_hours", "billable_hours", "entry_count", "billable_count")
+
+def rollup_day(start_time: datetime) -> date:
+    """UTC calendar day a time entry is rolled up under."""
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc)
+    return start_time.date()
+
+def aggregate_entries(entries: Iterable[dict]) -> list:
+    """Collapse entry dicts into one rollup delta per (user, task, day).
+
+    Each entry needs user_id, task_id, project_id, start_time, duration
+    and is_billable.
+    """
+    deltas = defaultdict(lambda: dict.fromkeys(ROLLUP_MEASURES, 0))
+    projects = {}
+    for entry in entries:
+        key = (entry["user_id"], entry["task_id"], rollup_day(entry["start_time"]))
+        duration = entry["duration"] or 0.0
+        billable = entry.get("is_billable", True)
+        delta = deltas[key]
+        delta["total_hours"] += duration
+        delta["entry_count"] += 1
+        if billable:
+            delta["billable_hours"] += duration
+            delta["billable_count"] += 1
+        projects[key] = entry.get("project_id")
+    return [
+        dict(zip(ROLLUP_KEY, key), project_id=projects[key], **delta)
+        for key, delta in deltas.items()
+    ]
+
+def _insert(dialect: str):
+    return (postgresql if dialect == "postgresql" else sqlite).insert(TimeRollup)
+
+def upsert_statement(dialect: str, rows: Optional[list] = None, source=None):
+    """INSERT ... ON CONFLICT that adds the given measures to existing rows.
+
+    Pass either literal ``rows`` or a ``source`` select producing the
+    key, project_id and measure columns in that order.
+    """
+    stmt = _insert(dialect)
+    if source is not None:
+        stmt = stmt.from_select(list(ROLLUP_KEY) + ["project_id"] + list(ROLLUP_MEASURES), source)
+    elif rows is not None:
+        stmt = stmt.values(rows)
+    table = TimeRollup.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            measure: table.c[measure] + stmt.excluded[measure]
+            for measure in ROLLUP_MEASURES
+        }
+    )
+
+def _key_clause(row: dict):
+    return [getattr(TimeRollup, column) == row[column] for column in ROLLUP_KEY]
+
+async def add_to_rollups(db: AsyncSession, entries: Iterable[dict]) -> None:
+    """Fold newly inserted entries into the rollups in the caller's transaction."""
+    rows = aggregate_entries(entries)
+    if rows:
+        await db.execute(upsert_statement(db.get_bind().dialect.name, rows))
+
+async def add_stored_to_rollups(db: AsyncSession, first_id: int, last_id: int) -> None:
+    """Fold already inserted entries with ids in [first_id, last_id] into the
+    rollups, reading their project ids in the same statement."""
+    await db.execute(
+        upsert_statement(db.get_bind().dialect.name, source=rebuild_source(first_id, last_id))
+    )
+
+async def remove_from_rollups(db: AsyncSession, entries: Iterable[dict]) -> None:
+    """Subtract deleted entries from the rollups and drop emptied rows."""
+    for row in aggregate_entries(entries):
+        await db.execute(
+            update(TimeRollup).where(*_key_clause(row)).values({
+                measure: getattr(TimeRollup, measure) - row[measure]
+                for measure in ROLLUP_MEASURES
+            })
+        )
+        await db.execute(
+            delete(TimeRollup).where(*_key_clause(row), TimeRollup.entry_count <= 0)
+        )
+
+async def drop_task_rollups(db: AsyncSession, task_id: int) -> None:
+    """Remove rollups of a task whose entries are being deleted with it."""
+    await db.execute(delete(TimeRollup).where(TimeRollup.task_id == task_id))
+
+async def drop_tasks_rollups(db: AsyncSession, task_ids) -> None:
+    """``drop_task_rollups`` for a list or subquery of task ids."""
+    await db.execute(delete(TimeRollup).where(TimeRollup.task_id.in_(task_ids)))
+
+async def drop_project_rollups(db: AsyncSession, project_id: int) -> None:
+    await db.execute(delete(TimeRollup).where(TimeRollup.project_id == project_id))
+
+async def drop_user_rollups(db: AsyncSession, user_id: int) -> None:
+    await db.execute(delete(TimeRollup).where(TimeRollup.user_id == user_id))
+
+def entry_values(entry: TimeEntry, project_id: Optional[int]) -> dict:
+    return {
+        "user_id": entry.user_id,
+        "task_id": entry.task_id,
+        "project_id": project_id,
+        "start_time": entry.start_time,
+        "duration": entry.duration,
+        "is_billable": entry.is_billable,
+    }
+
+def rebuild_source(first_id: int, last_id: int):
+    """Aggregate the time entries with ids in [first_id, last_id] by rollup key."""
+    day = func.date(TimeEntry.start_time, type_=Date)
+    billable = TimeEntry.is_billable.is_(True)
+    return select(
+        TimeEntry.user_id,
+        TimeEntry.task_id,
+        day,
+        func.max(Task.project_id),
+        func.coalesce(func.sum(TimeEntry.duration), 0.0),
+        func.coalesce(func.sum(TimeEntry.duration).filter(billable), 0.0),
+        func.count(TimeEntry.id),
+        func.count(TimeEntry.id).filter(billable),
+    ).join(
+        Task, Task.id == TimeEntry.task_id
+    ).where(
+        TimeEntry.id.between(first_id, last_id),
+        TimeEntry.user_id.is_not(None),
+        TimeEntry.start_time.is_not(None),
+    ).group_by(TimeEntry.user_id, TimeEntry.task_id, day)
+
+def rebuild_rollups(session, chunk_size: int = 50000, user_id: Optional[int] = None, log=print) -> int:
+    """Recompute the rollups from time_entries, ``chunk_size`` ids at a time.
+
+    Runs on a sync session and commits after every chunk. Entries written
+    while a rebuild is running are applied incrementally as usual, but
+    deletes of not-yet-processed entries can be double counted, so run it
+    during a quiet period. Returns the size of the id range processed.
+    """
+    dialect = session.get_bind().dialect.name
+    wipe = delete(TimeRollup)
+    bounds = select(func.min(TimeEntry.id), func.max(TimeEntry.id))
+    if user_id is not None:
+        wipe = wipe.where(TimeRollup.user_id == user_id)
+        bounds = bounds.where(TimeEntry.user_id == user_id)
+    session.execute(wipe)
+    session.commit()
+
+    first_id, last_id = session.execute(bounds).one()
+    if first_id is None:
+        return 0
+    scanned = 0
+    for start in range(first_id, last_id + 1, chunk_size):
+        end = min(start + chunk_size - 1, last_id)
+        source = rebuild_source(start, end)
+        if user_id is not None:
+            source = source.where(TimeEntry.user_id == user_id)
+        session.execute(upsert_statement(dialect, source=source))
+        session.commit()
+        scanned += end - start + 1
+        log(f"Rolled up time entries {start}..{end}")
+    return scanned
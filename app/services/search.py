@@ -0,0 +1,165 @@
+"""Ranked full-text search over a user's projects, tasks and time entries.
+
+PostgreSQL matches ``websearch_to_tsquery`` against the GIN-indexed
+``search_vector`` columns and ranks with ``ts_rank``. Snippets come from
+``ts_headline``, which re-parses the text, so it only runs on the page
+being returned. SQLite matches the FTS5 ``search_index`` table, where the
+query's words are ANDed and ranked with bm25. See
+``app.models.search_index`` for how both are kept current.
+
+Snippets are HTML: the database marks matches with private-use sentinel
+characters, the text is HTML-escaped, and only then do the sentinels
+become HIGHLIGHT_START/HIGHLIGHT_STOP. Titles are plain text.
+"""
+import html
+import re
+from typing import List, Optional, Sequence
+from sqlalchemy import String, cast, func, literal_column, null, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.project import Project
+from app.models.search_index import SQLITE_KIND_CODES, TEXT_SEARCH_CONFIG
+from app.models.task import Task
+from app.models.time_entry import TimeEntry
+from app.schemas.search import SearchKind
+from app.services.time_stats import dialect_name
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# Emitted by ts_headline/snippet() around matches, before escaping
+_SENTINEL_START = "\ue000"
+_SENTINEL_STOP = "\ue001"
+HEADLINE_OPTIONS = (
+    f"StartSel={_SENTINEL_START}, StopSel={_SENTINEL_STOP}, "
+    "MaxWords=24, MinWords=8, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+_WORD = re.compile(r"\w+")
+
+KIND_TABLES = {
+    SearchKind.PROJECT: "projects",
+    SearchKind.TASK: "tasks",
+    SearchKind.TIME_ENTRY: "time_entries",
+}
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """Escape a sentinel-marked snippet and turn the sentinels into highlights."""
+    if not snippet:
+        return None
+    return (
+        html.escape(snippet)
+        .replace(_SENTINEL_START, HIGHLIGHT_START)
+        .replace(_SENTINEL_STOP, HIGHLIGHT_STOP)
+    )
+
+def _postgresql_branches(user_id: int, tsquery, kinds: Sequence[SearchKind]) -> list:
+    """One SELECT per kind yielding kind, id, title, body and rank."""
+    documents = {
+        SearchKind.PROJECT: (
+            Project, Project.name, func.concat_ws(" ", Project.client_name, Project.description)
+        ),
+        SearchKind.TASK: (Task, Task.title, Task.description),
+        SearchKind.TIME_ENTRY: (TimeEntry, cast(null(), String), TimeEntry.description),
+    }
+    branches = []
+    for kind in kinds:
+        model, title, body = documents[kind]
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        branches.append(
+            select(
+                literal_column(f"'{kind.value}'").label("kind"),
+                model.id.label("id"),
+                title.label("title"),
+                body.label("body"),
+                func.ts_rank(vector, tsquery).label("rank"),
+            ).where(model.user_id == user_id, vector.op("@@")(tsquery))
+        )
+    return branches
+
+async def _search_postgresql(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    kinds: Sequence[SearchKind],
+    skip: int,
+    limit: int
+) -> list:
+    config = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+    tsquery = func.websearch_to_tsquery(config, query)
+    page = (
+        union_all(*_postgresql_branches(user_id, tsquery, kinds))
+        .order_by(literal_column("rank").desc(), literal_column("kind"), literal_column("id"))
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    snippet = func.ts_headline(config, page.c.body, tsquery, HEADLINE_OPTIONS)
+    rows = (await db.execute(
+        select(
+            page.c.kind,
+            page.c.id,
+            page.c.title,
+            snippet.label("snippet"),
+            page.c.rank,
+        ).order_by(page.c.rank.desc(), page.c.kind, page.c.id)
+    )).all()
+    return [dict(row._asdict(), snippet=render_snippet(row.snippet)) for row in rows]
+
+async def _search_sqlite(
+    db: AsyncSession,
+    user_id: int,
+    words: List[str],
+    kinds: Sequence[SearchKind],
+    skip: int,
+    limit: int
+) -> list:
+    kind_by_code = {SQLITE_KIND_CODES[KIND_TABLES[kind]]: kind for kind in kinds}
+    # Quoted so FTS5 treats every word as a plain term
+    match = " ".join('"%s"' % word.replace('"', '""') for word in words)
+    codes = ", ".join(str(code) for code in kind_by_code)
+    rows = (await db.execute(
+        text(f"""
+            SELECT rowid % 4 AS code, rowid / 4 AS id, title,
+                   snippet(search_index, 1, :start, :stop, '…', 16) AS snippet,
+                   -bm25(search_index, 10.0, 1.0) AS rank
+            FROM search_index
+            WHERE search_index MATCH :match AND user_id = :user_id
+              AND rowid % 4 IN ({codes})
+            ORDER BY rank DESC, code, id
+            LIMIT :limit OFFSET :skip
+        """),
+        {
+            "start": _SENTINEL_START,
+            "stop": _SENTINEL_STOP,
+            "match": match,
+            "user_id": user_id,
+            "limit": limit,
+            "skip": skip,
+        }
+    )).all()
+    return [
+        {
+            "kind": kind_by_code[row.code],
+            "id": row.id,
+            "title": row.title or None,
+            "snippet": render_snippet(row.snippet),
+            "rank": row.rank,
+        }
+        for row in rows
+    ]
+
+async def search(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    kinds: Optional[Sequence[SearchKind]] = None,
+    skip: int = 0,
+    limit: int = 20
+) -> list:
+    """Matches of ``query`` among ``user_id``'s rows, best first."""
+    words = _WORD.findall(query)
+    if not words:
+        return []
+    kinds = list(dict.fromkeys(kinds or SearchKind))
+    if dialect_name(db) == "postgresql":
+        return await _search_postgresql(db, user_id, query, kinds, skip, limit)
+    return await _search_sqlite(db, user_id, words, kinds, skip, limit)
@@ -0,0 +1,179 @@
+from datetime import date, datetime, time
+from typing import Optional
+from zoneinfo import ZoneInfo
+from sqlalchemy import DateTime, cast, func, literal, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.task import Task
+from app.models.time_entry import TimeEntry
+from app.models.time_rollup import TimeRollup
+from app.schemas.time_entry import TimeGrouping
+
+TIME_BUCKETS = (TimeGrouping.DAY, TimeGrouping.WEEK, TimeGrouping.MONTH)
+
+def dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+def local_time_bucket(column, grouping: TimeGrouping, tz: str, dialect: str):
+    """SQL expression truncating a naive-UTC ``column`` to a local bucket.
+
+    PostgreSQL converts with the full tz database. SQLite has no tz
+    support, so it shifts by the zone's current UTC offset; that is only
+    meant for local runs.
+    """
+    if dialect == "postgresql":
+        local = func.timezone(tz, func.timezone("UTC", column))
+        return func.date_trunc(grouping.value, local)
+
+    offset = datetime.now(ZoneInfo(tz)).utcoffset()
+    minutes = int(offset.total_seconds() // 60)
+    local = func.datetime(column, f"{minutes:+d} minutes")
+    if grouping is TimeGrouping.DAY:
+        return func.date(local)
+    if grouping is TimeGrouping.WEEK:
+        # Monday of the week, matching date_trunc('week', ...)
+        return func.date(local, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-01", local)
+
+def _bucket_key(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+def _day_aligned(value: Optional[datetime]) -> bool:
+    return value is None or (
+        value.time() == time(0)
+        and (value.tzinfo is None or not value.utcoffset())
+    )
+
+def can_use_rollups(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    group_by: Optional[TimeGrouping],
+    tz: str
+) -> bool:
+    """Rollups hold whole UTC days, so only day-aligned UTC requests fit them."""
+    if not settings.TIME_ROLLUPS_ENABLED:
+        return False
+    if group_by in TIME_BUCKETS and tz != "UTC":
+        return False
+    return _day_aligned(start_date) and _day_aligned(end_date)
+
+def _statistics(rows, group_by: Optional[TimeGrouping], tz: str) -> dict:
+    buckets = [
+        {
+            "key": _bucket_key(row[0]),
+            "total_time": row[1],
+            "billable_time": row[2],
+            "number_of_entries": row[3],
+        }
+        for row in rows
+        if row[3]
+    ]
+    statistics = {
+        "total_time": sum(bucket["total_time"] for bucket in buckets),
+        "billable_time": sum(bucket["billable_time"] for bucket in buckets),
+        "number_of_entries": sum(bucket["number_of_entries"] for bucket in buckets),
+    }
+    if group_by is not None:
+        statistics.update(group_by=group_by, timezone=tz, buckets=buckets)
+    return statistics
+
+async def _statistics_from_rollups(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    group_by: Optional[TimeGrouping]
+) -> dict:
+    total = func.coalesce(func.sum(TimeRollup.total_hours), 0.0)
+    billable = func.coalesce(func.sum(TimeRollup.billable_hours), 0.0)
+    count = func.coalesce(func.sum(TimeRollup.entry_count), 0)
+    billable_count = func.coalesce(func.sum(TimeRollup.billable_count), 0)
+
+    if group_by is None or group_by is TimeGrouping.BILLABLE:
+        key = literal(None)
+    elif group_by is TimeGrouping.DAY:
+        key = TimeRollup.day
+    elif group_by in TIME_BUCKETS:
+        dialect = dialect_name(db)
+        day = cast(TimeRollup.day, DateTime) if dialect == "postgresql" else TimeRollup.day
+        key = local_time_bucket(day, group_by, "UTC", dialect)
+    elif group_by is TimeGrouping.PROJECT:
+        key = TimeRollup.project_id
+    else:
+        key = TimeRollup.task_id
+
+    query = select(key.label("key"), total, billable, count, billable_count).where(
+        TimeRollup.user_id == user_id
+    )
+    if start_date:
+        query = query.where(TimeRollup.day >= start_date.date())
+    if end_date:
+        query = query.where(TimeRollup.day < end_date.date())
+    if group_by is not None and group_by is not TimeGrouping.BILLABLE:
+        query = query.group_by(key).order_by(key)
+
+    rows = (await db.execute(query)).all()
+    if group_by is TimeGrouping.BILLABLE:
+        _, total_time, billable_time, entries, billable_entries = rows[0]
+        rows = [
+            (False, total_time - billable_time, 0.0, entries - billable_entries),
+            (True, billable_time, billable_time, billable_entries),
+        ]
+    return _statistics(rows, group_by, "UTC")
+
+async def compute_time_statistics(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    group_by: Optional[TimeGrouping] = None,
+    tz: str = "UTC"
+) -> dict:
+    """Aggregate a user's time entries in the database.
+
+    Returns the overall totals and, when ``group_by`` is given, one bucket
+    per day/week/month (in ``tz``), project, task or billable flag.
+    Entries count when ``start_date <= start_time < end_date``. The whole
+    result comes from a single GROUP BY query, over the daily rollups
+    when the request is day-aligned and over time_entries otherwise.
+    """
+    if can_use_rollups(start_date, end_date, group_by, tz):
+        return await _statistics_from_rollups(db, user_id, start_date, end_date, group_by)
+
+    total = func.coalesce(func.sum(TimeEntry.duration), 0.0)
+    billable = func.coalesce(
+        func.sum(TimeEntry.duration).filter(TimeEntry.is_billable == true()), 0.0
+    )
+    count = func.count(TimeEntry.id)
+
+    if group_by is None:
+        key = literal(None)
+    elif group_by in TIME_BUCKETS:
+        key = local_time_bucket(TimeEntry.start_time, group_by, tz, dialect_name(db))
+    elif group_by is TimeGrouping.PROJECT:
+        key = Task.project_id
+    elif group_by is TimeGrouping.TASK:
+        key = TimeEntry.task_id
+    else:
+        key = TimeEntry.is_billable
+
+    query = select(key.label("key"), total, billable, count).where(
+        TimeEntry.user_id == user_id
+    )
+    if group_by is TimeGrouping.PROJECT:
+        query = query.join(Task, Task.id == TimeEntry.task_id)
+    if start_date:
+        query = query.where(TimeEntry.start_time >= start_date)
+    if end_date:
+        # Half-open on start time, like the rollups, which bucket an entry
+        # by the UTC day it started
+        query = query.where(TimeEntry.start_time < end_date)
+    if group_by is not None:
+        query = query.group_by(key).order_by(key)
+
+    rows = (await db.execute(query)).all()
+    return _statistics(rows, group_by, tz)
@@ -0,0 +1,7 @@
+"""Reproducible load tests for the FreelanceFlow API.
+
+Run ``python -m bench --help``. The seeder fills a database through the
+models in ``app.models``, the load driver calls ``app.main:app`` in
+process over httpx, and every run is stored as a JSON report that later
+runs can be compared against.
+"""
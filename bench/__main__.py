@@ -0,0 +1,97 @@
+"""Seed a database and load-test the API: ``python -m bench``.
+
+Without ``--database-url`` everything runs against a fresh SQLite file.
+Seeding drops and recreates every table, so a PostgreSQL URL must point
+at a throwaway database and be confirmed with ``--reset-database``.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+from bench.scales import SCALES
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to seed and test (default: a temporary SQLite file)")
+    parser.add_argument("--reset-database", action="store_true",
+                        help="Allow dropping and recreating the tables of a non-SQLite database")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="Reuse the data of a previous run against the same database")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request mix")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop after this many seconds even if requests remain")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--bcrypt-rounds", type=int, default=None,
+                        help="Override BCRYPT_ROUNDS for seeded users and login")
+    parser.add_argument("--output", default=None,
+                        help="Report path (default: bench-results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="Earlier report to compare against")
+    return parser.parse_args(argv)
+
+def configure_environment(args) -> str:
+    """Point the app's settings at the benchmark database before it is imported."""
+    url = args.database_url
+    if url is None:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="freelanceflow-bench-"), "bench.db")
+    elif not url.startswith("sqlite") and not args.skip_seed and not args.reset_database:
+        sys.exit("Seeding drops every table; pass --reset-database to confirm the URL is disposable")
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "freelanceflow-bench")
+    # The in-process client would log every request
+    os.environ.setdefault("LOG_LEVELS", '{"httpx": "WARNING"}')
+    # Every simulated client shares one address; measure the app, not the limiter
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    if args.bcrypt_rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    return url
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    url = configure_environment(args)
+
+    from app.db.base import SessionLocal, engine
+    from app.main import app
+    from bench import seed, report
+    from bench.load import SCENARIOS, run_load
+
+    with SessionLocal() as session:
+        if args.skip_seed:
+            users = seed.load_seeded_users(session)
+        else:
+            seed.reset_schema(engine)
+            users = seed.seed(session, SCALES[args.scale], seed=args.seed)
+    if not users:
+        sys.exit("No benchmark users found; run without --skip-seed first")
+
+    recorder = asyncio.run(run_load(
+        app, users,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        seed=args.seed,
+    ))
+    result = report.build_report(recorder, {
+        "database": engine.dialect.name,
+        "scale": args.scale,
+        "seed": args.seed,
+        "requests": args.requests,
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "bcrypt_rounds": args.bcrypt_rounds,
+        "scenarios": SCENARIOS,
+    })
+    output = args.output or os.path.join(
+        "bench-results", datetime.utcnow().strftime("%Y%m%dT%H%M%SZ") + ".json"
+    )
+    report.write_report(result, output)
+    baseline = report.load_report(args.baseline) if args.baseline else None
+    print(report.format_report(result, baseline))
+    print(f"Report written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Optional
+import httpx
+from bench.seed import PASSWORD, SeededUser
+
+# Relative weight of each scenario in the request mix
+SCENARIOS = {
+    "login": 1,
+    "list_projects": 4,
+    "list_tasks": 4,
+    "create_time_entry": 3,
+    "time_statistics": 2,
+}
+
+class Recorder:
+    """Latency samples (ms) and failures per scenario."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.elapsed = 0.0
+
+    def record(self, scenario: str, elapsed_ms: float, status_code: Optional[int]) -> None:
+        self.samples[scenario].append(elapsed_ms)
+        self.statuses[scenario][str(status_code)] += 1
+        if status_code is None or status_code >= 400:
+            self.errors[scenario] += 1
+
+class Session:
+    """A logged-in benchmark user."""
+
+    def __init__(self, user: SeededUser, token: str):
+        self.user = user
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+async def login(client: httpx.AsyncClient, email: str) -> httpx.Response:
+    return await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+
+async def open_sessions(client: httpx.AsyncClient, users: List[SeededUser], concurrency: int) -> List[Session]:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def open_session(user):
+        async with limit:
+            response = await login(client, user.email)
+        response.raise_for_status()
+        return Session(user, response.json()["access_token"])
+
+    return list(await asyncio.gather(*(open_session(user) for user in users)))
+
+async def _list_projects(client, session, login_users, rng):
+    return await client.get("/api/projects/my", params={"limit": 100}, headers=session.headers)
+
+async def _list_tasks(client, session, login_users, rng):
+    return await client.get("/api/tasks/my-tasks", params={"limit": 100}, headers=session.headers)
+
+async def _create_time_entry(client, session, login_users, rng):
+    start = datetime.utcnow().replace(microsecond=0) - timedelta(days=rng.randint(0, 30))
+    duration = rng.randint(1, 16) / 4
+    task_id = rng.choice(session.user.task_ids)
+    return await client.post(
+        f"/api/tasks/{task_id}/time",
+        json={
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=duration)).isoformat(),
+            "duration": duration,
+            "description": "Benchmark entry",
+            "is_billable": rng.random() < 0.8,
+        },
+        headers=session.headers,
+    )
+
+async def _time_statistics(client, session, login_users, rng):
+    return await client.get(
+        f"/api/users/{session.user.id}/time-statistics",
+        params={"group_by": rng.choice(["project", "month", "billable"])},
+        headers=session.headers,
+    )
+
+async def _login(client, session, login_users, rng):
+    # Logging in replaces the user's token, so these users never hold a session
+    return await login(client, rng.choice(login_users).email)
+
+HANDLERS = {
+    "login": _login,
+    "list_projects": _list_projects,
+    "list_tasks": _list_tasks,
+    "create_time_entry": _create_time_entry,
+    "time_statistics": _time_statistics,
+}
+
+async def run_load(
+    app,
+    users: List[SeededUser],
+    requests: int,
+    concurrency: int,
+    duration: Optional[float] = None,
+    seed: int = 42,
+    scenarios: Optional[dict] = None,
+) -> Recorder:
+    """Drive ``app`` in process with ``concurrency`` workers.
+
+    Stops after ``requests`` requests or ``duration`` seconds, whichever
+    comes first. A tenth of the users are kept aside for the login
+    scenario; the rest log in once up front and issue everything else.
+    """
+    scenarios = scenarios or SCENARIOS
+    users = [user for user in users if user.task_ids]
+    login_users = users[:max(1, len(users) // 10)] if "login" in scenarios else []
+    session_users = users[len(login_users):] or users
+    names = list(scenarios)
+    weights = [scenarios[name] for name in names]
+    recorder = Recorder()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        sessions = await open_sessions(client, session_users, concurrency)
+        issued = 0
+        started = time.perf_counter()
+        deadline = started + duration if duration else None
+
+        async def worker(worker_id: int):
+            nonlocal issued
+            rng = random.Random(seed * 1000 + worker_id)
+            while issued < requests and (deadline is None or time.perf_counter() < deadline):
+                issued += 1
+                name = rng.choices(names, weights)[0]
+                session = rng.choice(sessions)
+                began = time.perf_counter()
+                try:
+                    response = await HANDLERS[name](client, session, login_users, rng)
+                    status_code = response.status_code
+                except httpx.HTTPError:
+                    status_code = None
+                recorder.record(name, (time.perf_counter() - began) * 1000, status_code)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        recorder.elapsed = time.perf_counter() - started
+    return recorder
@@ -0,0 +1,89 @@
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime
+from typing import Optional
+from bench.load import Recorder
+
+PERCENTILES = (50, 95, 99)
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+def _summary(samples: list, errors: int, elapsed: float) -> dict:
+    values = sorted(samples)
+    summary = {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}_ms"] = round(percentile(values, q), 3)
+    return summary
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_report(recorder: Recorder, config: dict) -> dict:
+    every_sample = [value for samples in recorder.samples.values() for value in samples]
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": config,
+        "elapsed_seconds": round(recorder.elapsed, 3),
+        "total": _summary(every_sample, sum(recorder.errors.values()), recorder.elapsed),
+        "scenarios": {
+            name: dict(
+                _summary(samples, recorder.errors[name], recorder.elapsed),
+                statuses=dict(recorder.statuses[name]),
+            )
+            for name, samples in sorted(recorder.samples.items())
+        },
+    }
+
+def write_report(report: dict, path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def _change(current: float, baseline: float) -> str:
+    if not baseline:
+        return "n/a"
+    return f"{(current - baseline) / baseline * 100:+.1f}%"
+
+def format_report(report: dict, baseline: Optional[dict] = None) -> str:
+    """Render a report as a table, with the change against ``baseline``."""
+    columns = ["requests", "errors", "throughput_rps"] + [f"p{q}_ms" for q in PERCENTILES]
+    lines = [f"{'scenario':<20}" + "".join(f"{column:>16}" for column in columns)]
+    rows = dict(report["scenarios"], total=report["total"])
+    for name, summary in rows.items():
+        lines.append(f"{name:<20}" + "".join(f"{summary[column]:>16}" for column in columns))
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if name == "total" and baseline:
+            previous = baseline["total"]
+        if previous:
+            lines.append(f"{'  vs baseline':<20}" + "".join(
+                f"{_change(summary[column], previous.get(column, 0)):>16}" for column in columns
+            ))
+    return "\n".join(lines)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+@dataclass
+class Scale:
+    users: int
+    projects_per_user: int
+    tasks_per_project: int
+    entries_per_task: int
+
+SCALES = {
+    "tiny": Scale(users=20, projects_per_user=2, tasks_per_project=5, entries_per_task=3),
+    "small": Scale(users=200, projects_per_user=3, tasks_per_project=10, entries_per_task=10),
+    # ~2k users, 100k tasks, 2M time entries
+    "large": Scale(users=2000, projects_per_user=5, tasks_per_project=10, entries_per_task=20),
+}
@@ -0,0 +1,151 @@
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import insert, select
+from app.core import security
+from app.models import Base, Project, Task, TimeEntry, User
+from app.models.project import ProjectStatus
+from app.models.task import TaskPriority, TaskStatus
+from app.services import rollups
+from bench.scales import Scale
+
+PASSWORD = "bench-password"
+
+@dataclass
+class SeededUser:
+    id: int
+    email: str
+    task_ids: List[int] = field(default_factory=list)
+
+def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def reset_schema(engine) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+def seed(session, scale: Scale, seed: int = 42, chunk_size: int = 10000, log=print) -> List[SeededUser]:
+    """Insert a deterministic synthetic dataset and return the seeded users."""
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    now = datetime.utcnow().replace(microsecond=0)
+    hashed_password = security.get_password_hash(PASSWORD)
+
+    users = [
+        {
+            "username": f"bench{i}@example.com",
+            "email": f"bench{i}@example.com",
+            "hashed_password": hashed_password,
+            "first_name": "Bench",
+            "last_name": str(i),
+            "is_active": True,
+            "hourly_rate": rng.choice([25.0, 40.0, 60.0, 90.0]),
+            "registration_date": now,
+        }
+        for i in range(scale.users)
+    ]
+    for chunk in _chunks(users, chunk_size):
+        session.execute(insert(User), chunk)
+    session.commit()
+    user_ids = dict(session.execute(
+        select(User.email, User.id).where(User.email.like("bench%@example.com"))
+    ).all())
+    seeded = {user_ids[row["email"]]: SeededUser(user_ids[row["email"]], row["email"]) for row in users}
+    log(f"users: {len(seeded)}")
+
+    projects = []
+    for user_id in seeded:
+        for p in range(scale.projects_per_user):
+            start = now - timedelta(days=rng.randint(30, 730))
+            projects.append({
+                "user_id": user_id,
+                "name": f"Project {p}",
+                "description": "Synthetic benchmark project",
+                "start_date": start,
+                "end_date": None,
+                "status": rng.choice(list(ProjectStatus)),
+                "client_name": f"Client {rng.randint(1, 50)}",
+                "budget": float(rng.randint(1, 100) * 500),
+                "total_tasks": 0,
+                "completed_tasks": 0,
+            })
+    for chunk in _chunks(projects, chunk_size):
+        session.execute(insert(Project), chunk)
+    session.commit()
+    project_rows = session.execute(
+        select(Project.id, Project.user_id).where(Project.user_id.in_(list(seeded)))
+    ).all()
+    log(f"projects: {len(project_rows)}")
+
+    tasks = []
+    for project_id, user_id in project_rows:
+        for t in range(scale.tasks_per_project):
+            created = now - timedelta(days=rng.randint(0, 700), minutes=rng.randint(0, 1440))
+            tasks.append({
+                "project_id": project_id,
+                "user_id": user_id,
+                "title": f"Task {t}",
+                "description": "Synthetic benchmark task",
+                "status": rng.choice(list(TaskStatus)),
+                "priority": rng.choice(list(TaskPriority)),
+                "created_at": created,
+                "updated_at": created,
+                "due_time": created + timedelta(days=rng.randint(1, 60)),
+                "estimated_hours": float(rng.randint(1, 40)),
+            })
+    for chunk in _chunks(tasks, chunk_size):
+        session.execute(insert(Task), chunk)
+    session.commit()
+    task_rows = session.execute(
+        select(Task.id, Task.user_id).where(Task.user_id.in_(list(seeded)))
+    ).all()
+    for task_id, user_id in task_rows:
+        seeded[user_id].task_ids.append(task_id)
+    log(f"tasks: {len(task_rows)}")
+
+    entries = []
+    inserted = 0
+    for task_id, user_id in task_rows:
+        for _ in range(scale.entries_per_task):
+            start = now - timedelta(days=rng.randint(0, 700), minutes=rng.randint(0, 1440))
+            duration = rng.randint(1, 32) / 4
+            entries.append({
+                "task_id": task_id,
+                "user_id": user_id,
+                "start_time": start,
+                "end_time": start + timedelta(hours=duration),
+                "duration": duration,
+                "description": "Synthetic work",
+                "is_billable": rng.random() < 0.8,
+            })
+        if len(entries) >= chunk_size:
+            session.execute(insert(TimeEntry), entries)
+            session.commit()
+            inserted += len(entries)
+            entries = []
+    if entries:
+        session.execute(insert(TimeEntry), entries)
+        session.commit()
+        inserted += len(entries)
+    log(f"time entries: {inserted}")
+
+    rollups.rebuild_rollups(session, log=lambda message: None)
+    log(f"seeded in {time.perf_counter() - started:.1f}s")
+    return list(seeded.values())
+
+def load_seeded_users(session) -> List[SeededUser]:
+    """Find the users of a previous ``seed`` run, for ``--skip-seed``."""
+    seeded = {
+        user_id: SeededUser(user_id, email)
+        for user_id, email in session.execute(
+            select(User.id, User.email).where(User.email.like("bench%@example.com")).order_by(User.id)
+        )
+    }
+    for task_id, user_id in session.execute(
+        select(Task.id, Task.user_id).where(Task.user_id.in_(list(seeded)))
+    ):
+        seeded[user_id].task_ids.append(task_id)
+    return list(seeded.values())
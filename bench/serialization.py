@@ -0,0 +1,90 @@
+"""Per-row cost of list serialization: ``python -m bench.serialization``.
+
+Compares, on a page of tasks read from an in-memory SQLite database,
+the response_model path (ORM instances validated with from_attributes,
+then dumped by Pydantic, as FastAPI does) with the fast path in
+``app.core.serialization`` (column rows encoded by orjson). Both
+produce the same bytes; the check runs before timing.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from app.core.serialization import rows_response, schema_columns
+from app.models import Base, Project, Task, User
+from app.models.task import TaskPriority, TaskStatus
+from app.schemas.task import Task as TaskSchema
+
+def build_database(rows: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.execute(insert(User).values(id=1, email="bench@example.com", username="bench@example.com"))
+        session.execute(insert(Project).values(id=1, user_id=1, name="Bench"))
+        session.execute(insert(Task), [
+            {
+                "project_id": 1,
+                "user_id": 1,
+                "title": f"Task {i}",
+                "description": "Synthetic benchmark task",
+                "status": list(TaskStatus)[i % 4],
+                "priority": list(TaskPriority)[i % 4],
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now,
+                "due_time": now + timedelta(days=i % 30),
+                "estimated_hours": float(i % 40),
+            }
+            for i in range(rows)
+        ])
+        session.commit()
+    return engine
+
+def response_model_path(session: Session, adapter: TypeAdapter) -> bytes:
+    tasks = session.scalars(select(Task).order_by(Task.id)).all()
+    body = adapter.dump_json(adapter.validate_python(tasks, from_attributes=True))
+    session.expunge_all()
+    return body
+
+def fast_path(session: Session, columns: list) -> bytes:
+    rows = session.execute(select(*columns).order_by(Task.id)).all()
+    return rows_response(rows, columns, Response()).body
+
+def measure(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.serialization")
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    engine = build_database(args.rows)
+    adapter = TypeAdapter(List[TaskSchema])
+    columns = schema_columns(Task, TaskSchema)
+    with Session(engine) as session:
+        expected = response_model_path(session, adapter)
+        actual = fast_path(session, columns)
+        if json.loads(expected) != json.loads(actual):
+            raise SystemExit("Fast path output differs from response_model output")
+
+        results = {
+            "response_model": measure(lambda: response_model_path(session, adapter), args.iterations),
+            "orjson_rows": measure(lambda: fast_path(session, columns), args.iterations),
+        }
+
+    print(f"{args.rows} rows per page, {args.iterations} iterations")
+    for name, seconds in results.items():
+        print(f"{name:<16}{seconds * 1000:>10.3f} ms/page{seconds / args.rows * 1e6:>10.2f} us/row")
+    print(f"speedup         {results['response_model'] / results['orjson_rows']:>10.2f}x")
+
+if __name__ == "__main__":
+    main()
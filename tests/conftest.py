@@ -0,0 +1,75 @@
+"""Test setup: the app on a throwaway SQLite file with the schema and triggers.
+
+Settings are read when app.core.config is first imported, so the
+environment is prepared before anything from ``app`` is.
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="freelanceflow-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_DB_DIR}/test.db",
+    DATABASE_REPLICA_URLS="[]",
+    SECRET_KEY="test-secret",
+    BCRYPT_ROUNDS="4",
+    RATE_LIMIT_ENABLED="false",
+    METRICS_ENABLED="false",
+    LOG_LEVEL="WARNING",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.dependencies import principal_cache
+from app.core.result_cache import result_cache
+from app.db.session import engine
+from app.main import app
+from app.models import Base
+
+PROJECT = {
+    "name": "Website",
+    "start_date": "2026-01-01T00:00:00",
+    "end_date": None,
+    "status": "planning",
+    "client_name": "Acme",
+    "budget": 1000.0,
+}
+
+
+@pytest.fixture
+def client():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    principal_cache.clear()
+    result_cache.backend.cache.clear()
+    with TestClient(app) as client:
+        yield client
+
+
+def register(client: TestClient, email: str = "ann@example.com") -> dict:
+    """Register ``email`` and return the Authorization header of its token."""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": email, "password": "secret", "first_name": "Ann"},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_project(client: TestClient, headers: dict, **values) -> dict:
+    response = client.post("/api/projects", headers=headers, json=dict(PROJECT, **values))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_task(client: TestClient, headers: dict, project_id: int, **values) -> dict:
+    task = {
+        "title": "Design",
+        "status": "todo",
+        "priority": "low",
+        "due_time": None,
+        "estimated_hours": 1,
+        "project_id": project_id,
+    }
+    response = client.post("/api/tasks", headers=headers, json=dict(task, **values))
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,33 @@
+from sqlalchemy import insert, select
+from app.core.dependencies import principal_cache
+from app.db.session import engine
+from app.models.role import Role
+from app.models.user import User, user_role
+from tests.conftest import register
+
+
+def grant_role(email: str, name: str) -> None:
+    with engine.begin() as connection:
+        role_id = connection.execute(insert(Role).values(name=name).returning(Role.id)).scalar_one()
+        user_id = connection.scalar(select(User.id).where(User.email == email))
+        connection.execute(insert(user_role).values(user_id=user_id, role_id=role_id))
+
+
+def test_cached_principal_is_rejected_after_role_change(client):
+    headers = register(client)
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+    assert len(principal_cache) == 1
+
+    grant_role("ann@example.com", "admin")
+
+    assert client.get("/api/users/me", headers=headers).status_code == 401
+
+
+def test_login_after_role_change_carries_the_new_roles(client):
+    register(client)
+    grant_role("ann@example.com", "admin")
+    login = client.post("/api/auth/login", json={"email": "ann@example.com", "password": "secret"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+    assert client.get("/api/internal/pool", headers=headers).status_code == 200
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from tests.conftest import create_project, create_task, register
+
+SOON = format_datetime(datetime.now(timezone.utc) + timedelta(minutes=1), usegmt=True)
+
+
+def test_listing_etag_round_trip(client):
+    headers = register(client)
+    create_project(client, headers)
+    first = client.get("/api/projects/my", headers=headers)
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/projects/my", headers=dict(headers, **{"If-None-Match": etag}))
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+
+    create_project(client, headers, name="Second")
+    changed = client.get("/api/projects/my", headers=dict(headers, **{"If-None-Match": etag}))
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_listing_etag_differs_per_query(client):
+    headers = register(client)
+    create_project(client, headers)
+    everything = client.get("/api/projects/my", headers=headers).headers["ETag"]
+    planning = client.get("/api/projects/my?status=planning", headers=headers).headers["ETag"]
+    assert everything != planning
+
+
+def test_listings_do_not_use_last_modified(client):
+    headers = register(client)
+    project = create_project(client, headers)
+    task = create_task(client, headers, project["id"])
+    create_task(client, headers, project["id"], title="Kept")
+    listing = client.get("/api/tasks/my-tasks", headers=headers)
+    assert "Last-Modified" not in listing.headers
+
+    client.delete(f"/api/tasks/{task['id']}", headers=headers)
+    poll = client.get("/api/tasks/my-tasks", headers=dict(headers, **{"If-Modified-Since": SOON}))
+    assert poll.status_code == 200
+    assert [row["title"] for row in poll.json()] == ["Kept"]
+
+
+def test_single_project_honours_if_modified_since(client):
+    headers = register(client)
+    project = create_project(client, headers)
+    first = client.get(f"/api/projects/{project['id']}", headers=headers)
+    assert "Last-Modified" in first.headers
+
+    conditional = dict(headers, **{"If-Modified-Since": first.headers["Last-Modified"]})
+    assert client.get(f"/api/projects/{project['id']}", headers=conditional).status_code == 304
+
+    # If-None-Match wins when both are sent
+    both = dict(conditional, **{"If-None-Match": 'W/"other"'})
+    assert client.get(f"/api/projects/{project['id']}", headers=both).status_code == 200
+
+
+def test_task_etag(client):
+    headers = register(client)
+    project = create_project(client, headers)
+    task = create_task(client, headers, project["id"])
+    etag = client.get(f"/api/tasks/{task['id']}", headers=headers).headers["ETag"]
+    conditional = dict(headers, **{"If-None-Match": etag})
+    assert client.get(f"/api/tasks/{task['id']}", headers=conditional).status_code == 304
+
+    client.put(f"/api/tasks/{task['id']}/status/completed", headers=headers)
+    assert client.get(f"/api/tasks/{task['id']}", headers=conditional).status_code == 200
@@ -0,0 +1,103 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import update
+from app.core.config import settings
+from app.db.session import engine
+from app.models.user import User
+from app.services.invoicing import month_period, money, previous_month, round_hours
+from tests.conftest import create_project, create_task, register
+
+
+def test_month_period():
+    assert month_period(2026, 1) == (datetime(2026, 1, 1), datetime(2026, 2, 1))
+    assert month_period(2026, 11) == (datetime(2026, 11, 1), datetime(2026, 12, 1))
+    assert month_period(2026, 12) == (datetime(2026, 12, 1), datetime(2027, 1, 1))
+
+
+def test_previous_month():
+    assert previous_month(datetime(2026, 3, 15)) == (2026, 2)
+    assert previous_month(datetime(2026, 1, 1)) == (2025, 12)
+
+
+@pytest.mark.parametrize("mode, hours, expected", [
+    ("half_up", 1.25, "1.30"),
+    ("half_up", 1.24, "1.20"),
+    ("up", 1.21, "1.30"),
+    ("down", 1.29, "1.20"),
+    # Float noise must not push "up" into another increment
+    ("up", 0.1 + 0.2 + 0.9, "1.20"),
+])
+def test_round_hours(monkeypatch, mode, hours, expected):
+    monkeypatch.setattr(settings, "INVOICE_HOURS_INCREMENT", 0.1)
+    monkeypatch.setattr(settings, "INVOICE_HOURS_ROUNDING", mode)
+    assert round_hours(hours) == Decimal(expected)
+
+
+def test_round_hours_quarter_increment(monkeypatch):
+    monkeypatch.setattr(settings, "INVOICE_HOURS_INCREMENT", 0.25)
+    monkeypatch.setattr(settings, "INVOICE_HOURS_ROUNDING", "half_up")
+    assert round_hours(1.13) == Decimal("1.25")
+    assert round_hours(1.12) == Decimal("1.00")
+
+
+def test_money_rounds_half_up():
+    assert money(2.675) == Decimal("2.68")
+    assert money(Decimal("0.005")) == Decimal("0.01")
+
+
+def log_time(client, headers, task_id: int, start: str, end: str, hours: float, billable: bool = True):
+    response = client.post(
+        f"/api/tasks/{task_id}/time",
+        headers=headers,
+        json={"start_time": start, "end_time": end, "duration": hours, "is_billable": billable},
+    )
+    assert response.status_code == 200, response.text
+
+
+@pytest.fixture
+def september(client):
+    headers = register(client)
+    with engine.begin() as connection:
+        connection.execute(update(User).values(hourly_rate=50.0))
+    project = create_project(client, headers)
+    task = create_task(client, headers, project["id"])
+    log_time(client, headers, task["id"], "2026-09-01T00:00:00", "2026-09-01T01:00:00", 1.0)
+    # Starts in September, so billed in September although it ends in October
+    log_time(client, headers, task["id"], "2026-09-30T23:30:00", "2026-10-01T00:15:00", 0.75)
+    log_time(client, headers, task["id"], "2026-09-15T10:00:00", "2026-09-15T12:00:00", 2.0, billable=False)
+    # Starts at the period end, so belongs to October
+    log_time(client, headers, task["id"], "2026-10-01T00:00:00", "2026-10-01T03:00:00", 3.0)
+    return headers
+
+
+def preview(client, headers, start: str, end: str) -> list:
+    response = client.get(
+        "/api/invoices/preview", headers=headers, params={"period_start": start, "period_end": end}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize("rollups", [True, False])
+def test_month_is_half_open_on_start_time(client, september, monkeypatch, rollups):
+    monkeypatch.setattr(settings, "TIME_ROLLUPS_ENABLED", rollups)
+    monkeypatch.setattr(settings, "INVOICE_HOURS_INCREMENT", 0.1)
+    monkeypatch.setattr(settings, "INVOICE_HOURS_ROUNDING", "half_up")
+    [invoice] = preview(client, september, "2026-09-01T00:00:00", "2026-10-01T00:00:00")
+    assert invoice["total_hours"] == 1.8
+    assert invoice["total_amount"] == 90.0
+    assert invoice["line_items"][0]["entry_count"] == 2
+
+    [october] = preview(client, september, "2026-10-01T00:00:00", "2026-11-01T00:00:00")
+    assert october["total_hours"] == 3.0
+
+
+def test_generating_twice_skips_invoiced_clients(client, september):
+    period = {"period_start": "2026-09-01T00:00:00", "period_end": "2026-10-01T00:00:00"}
+    first = client.post("/api/invoices", headers=september, json=dict(period, client_name="Acme"))
+    assert first.status_code == 200, first.text
+    assert len(first.json()["line_items"]) == 1
+
+    second = client.post("/api/invoices", headers=september, json=dict(period, client_name="Acme"))
+    assert second.status_code == 409
@@ -0,0 +1,41 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from tests.conftest import create_project, create_task, register
+
+
+def test_cursor_round_trip():
+    values = [datetime(2026, 3, 1, 12, 30, 15, 250000), 42, "b"]
+    assert decode_cursor(encode_cursor(values), 3) == values
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor([1]), encode_cursor([{"x": 1}, 2])])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+def test_listing_pages_through_every_row_once(client):
+    headers = register(client)
+    project = create_project(client, headers)
+    created = [create_task(client, headers, project["id"], title=f"T{n}")["id"] for n in range(5)]
+
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get("/api/tasks/my-tasks", headers=headers, params=params)
+        assert response.status_code == 200
+        seen += [task["id"] for task in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert seen == created
+
+
+def test_listing_rejects_a_bad_cursor(client):
+    headers = register(client)
+    response = client.get("/api/projects/my", headers=headers, params={"cursor": "garbage"})
+    assert response.status_code == 400
@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+import pytest
+from app.core.config import settings
+from app.db.replicas import Replica, ReplicaDisconnected, replica_set
+from tests.conftest import PROJECT, register
+
+
+def lag_row(in_recovery=True, streaming=True, caught_up=False, replay_age=1.5):
+    return SimpleNamespace(
+        in_recovery=in_recovery, streaming=streaming, caught_up=caught_up, replay_age=replay_age
+    )
+
+
+@pytest.fixture
+def replica(client, tmp_path, monkeypatch):
+    """A SQLite replica of the test database, registered with the app."""
+    replica = Replica("replica0", f"sqlite:///{tmp_path}/replica.db")
+    monkeypatch.setattr(replica_set, "replicas", [replica])
+    yield replica
+    client.portal.call(replica.engine.dispose)
+
+
+def disconnect(replica: Replica, replay_age=None) -> None:
+    async def measure_lag():
+        return replica.replay_lag(lag_row(streaming=False, replay_age=replay_age))
+    replica.measure_lag = measure_lag
+
+
+def test_replay_lag(client):
+    replica = Replica("replica0", "sqlite://")
+    assert replica.replay_lag(lag_row(in_recovery=False)) == 0.0
+    assert replica.replay_lag(lag_row(caught_up=True)) == 0.0
+    assert replica.replay_lag(lag_row()) == 1.5
+    assert replica.replay_lag(lag_row(replay_age=None)) is None
+
+    with pytest.raises(ReplicaDisconnected):
+        replica.replay_lag(lag_row(streaming=False, caught_up=True))
+    assert replica.lag_seconds == 1.5
+
+
+def test_unknown_lag_is_not_usable(client, replica):
+    replica.healthy, replica.lag_seconds = True, None
+    assert not replica.usable
+    replica.lag_seconds = settings.REPLICA_MAX_LAG_SECONDS + 1
+    assert not replica.usable
+    replica.lag_seconds = 0.0
+    assert replica.usable
+
+
+def test_readiness_reports_a_disconnected_replica(client, replica):
+    disconnect(replica)
+    client.portal.call(replica_set.check)
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    [reported] = json.loads(response.content)["replicas"]["replicas"]
+    assert reported["healthy"] is False
+    assert reported["usable"] is False
+    assert reported["lag_seconds"] is None
+    assert "ReplicaDisconnected" in reported["error"]
+
+
+def test_reads_fall_back_to_the_primary(client, replica):
+    headers = register(client)
+    user_id = client.get("/api/users/me", headers=headers).json()["id"]
+    replica_set.pinned.clear()
+    fallbacks = replica_set.fallback_reads
+
+    # Not yet checked, so not usable
+    assert replica_set.choose(user_id) is None
+    assert replica_set.fallback_reads == fallbacks + 1
+
+    client.portal.call(replica_set.check)
+    assert replica.usable
+    assert replica_set.choose(user_id) is replica
+
+    disconnect(replica, replay_age=2.0)
+    client.portal.call(replica_set.check)
+    assert not replica.usable
+    assert replica_set.choose(user_id) is None
+    assert replica_set.fallback_reads == fallbacks + 2
+
+
+def test_writes_pin_reads_to_the_primary(client, replica):
+    headers = register(client)
+    client.portal.call(replica_set.check)
+    replica_set.pinned.clear()
+    before, pinned = replica.reads, replica_set.pinned_reads
+
+    # Checked before the project existed, so the replica's listing is empty
+    client.post("/api/projects", headers=headers, json=PROJECT)
+    assert len(client.get("/api/projects/my", headers=headers).json()) == 1
+    assert replica.reads == before
+    assert replica_set.pinned_reads == pinned + 1
+
+    replica_set.pinned.clear()
+    client.get("/api/tasks/my-tasks", headers=headers)
+    assert replica.reads == before + 1
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime
+from sqlalchemy import insert, select
+from app.core.result_cache import MemoryResultCacheBackend, ResultCache, result_cache, user_tags
+from app.db.session import engine
+from app.models.project import Project
+from tests.conftest import PROJECT, create_project, register
+
+
+def new_cache() -> ResultCache:
+    return ResultCache(MemoryResultCacheBackend(max_entries=100, max_bytes=1 << 20))
+
+
+def test_concurrent_misses_compute_once():
+    cache = new_cache()
+    computations = 0
+
+    async def compute():
+        nonlocal computations
+        computations += 1
+        await asyncio.sleep(0.01)
+        return {"value": 1}
+
+    async def stampede():
+        return await asyncio.gather(*(
+            cache.get_or_compute("key", ["tasks:1"], compute) for _ in range(20)
+        ))
+
+    assert asyncio.run(stampede()) == [{"value": 1}] * 20
+    assert computations == 1
+    assert (cache.misses, cache.coalesced) == (1, 19)
+    assert not cache._flights
+
+
+def test_result_invalidated_mid_computation_is_not_stored():
+    cache = new_cache()
+
+    async def compute():
+        await cache.invalidate_tags(["tasks:1"])
+        return {"value": 1}
+
+    async def run():
+        await cache.get_or_compute("key", ["tasks:1"], compute)
+        return await cache.backend.get("key")
+
+    assert asyncio.run(run()) is None
+    assert cache.stale_results == 1
+
+
+def test_tags_invalidate_only_matching_entries():
+    cache = new_cache()
+
+    async def run():
+        async def compute():
+            return {"value": 1}
+        await cache.get_or_compute("a", user_tags(1, "tasks"), compute)
+        await cache.get_or_compute("b", user_tags(1, "projects"), compute)
+        await cache.get_or_compute("c", user_tags(2, "tasks"), compute)
+        await cache.invalidate_tags(user_tags(1, "tasks"))
+        return [await cache.backend.get(key) for key in "abc"]
+
+    assert asyncio.run(run()) == [None, {"value": 1}, {"value": 1}]
+
+
+def test_writes_invalidate_cached_listings(client):
+    headers = register(client)
+    create_project(client, headers)
+    assert len(client.get("/api/projects/my", headers=headers).json()) == 1
+    hits = result_cache.hits
+    assert len(client.get("/api/projects/my", headers=headers).json()) == 1
+    assert result_cache.hits == hits + 1
+
+    create_project(client, headers, name="Second")
+    assert len(client.get("/api/projects/my", headers=headers).json()) == 2
+
+
+def test_current_etag_gets_304_without_building_a_page(client):
+    headers = register(client)
+    create_project(client, headers)
+    etag = client.get("/api/projects/my", headers=headers).headers["ETag"]
+    result_cache.backend.cache.clear()
+    misses = result_cache.misses
+
+    response = client.get("/api/projects/my", headers=dict(headers, **{"If-None-Match": etag}))
+    assert response.status_code == 304
+    assert result_cache.misses == misses
+    assert len(result_cache.backend.cache) == 0
+
+
+def test_listing_sees_writes_this_process_was_not_told_about(client):
+    headers = register(client)
+    project = create_project(client, headers)
+    assert len(client.get("/api/projects/my", headers=headers).json()) == 1
+
+    # As if another worker wrote: no invalidation reaches this cache
+    with engine.begin() as connection:
+        user_id = connection.scalar(select(Project.user_id).where(Project.id == project["id"]))
+        connection.execute(insert(Project).values(
+            dict(PROJECT, name="Elsewhere", start_date=datetime(2026, 2, 1), user_id=user_id)
+        ))
+    assert len(client.get("/api/projects/my", headers=headers).json()) == 2
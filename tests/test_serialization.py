@@ -0,0 +1,36 @@
+import pytest
+from app.core import serialization
+from app.core.config import settings
+from app.core.result_cache import result_cache
+from tests.conftest import create_project, create_task, register
+
+
+@pytest.mark.parametrize("path", ["/api/projects/my", "/api/tasks/my-tasks"])
+def test_both_list_encoders_agree(client, monkeypatch, path):
+    headers = register(client)
+    project = create_project(client, headers, description="Ünïcode")
+    create_task(client, headers, project["id"], due_time="2026-05-01T09:30:00", estimated_hours=2.5)
+
+    pages = {}
+    for fast in (True, False):
+        monkeypatch.setattr(settings, "FAST_LIST_SERIALIZATION", fast)
+        result_cache.backend.cache.clear()
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200
+        pages[fast] = response.json()
+    assert pages[True] == pages[False]
+
+
+def test_flag_off_skips_orjson(client, monkeypatch):
+    headers = register(client)
+    create_project(client, headers)
+
+    def fail(rows, columns):
+        raise AssertionError("orjson fast path used with FAST_LIST_SERIALIZATION off")
+    monkeypatch.setattr(serialization, "encode_rows", fail)
+    monkeypatch.setattr(settings, "FAST_LIST_SERIALIZATION", False)
+
+    for enabled in (True, False):
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", enabled)
+        result_cache.backend.cache.clear()
+        assert client.get("/api/projects/my", headers=headers).status_code == 200
@@ -0,0 +1,23 @@
+import os
+import pytest
+from app.core.config import settings
+from app.server import check_result_cache
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.setenv("RESULT_CACHE_ENABLED", "true")
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+
+
+def test_memory_result_cache_is_disabled_for_several_workers(monkeypatch):
+    monkeypatch.setattr(settings, "RESULT_CACHE_BACKEND", "memory")
+    check_result_cache(4)
+    assert os.environ["RESULT_CACHE_ENABLED"] == "false"
+
+
+@pytest.mark.parametrize("workers, backend", [(1, "memory"), (4, "shared.cache:Backend")])
+def test_result_cache_is_kept(monkeypatch, workers, backend):
+    monkeypatch.setattr(settings, "RESULT_CACHE_BACKEND", backend)
+    check_result_cache(workers)
+    assert os.environ["RESULT_CACHE_ENABLED"] == "true"
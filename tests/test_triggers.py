@@ -0,0 +1,85 @@
+from sqlalchemy import delete, insert, select, update
+from app.db.session import engine
+from app.models.project import Project
+from app.models.role import Role
+from app.models.task import Task
+from app.models.user import User, user_role
+from tests.conftest import create_project, create_task, register
+
+
+def counters(project_id: int) -> tuple:
+    with engine.connect() as connection:
+        return tuple(connection.execute(
+            select(Project.total_tasks, Project.completed_tasks, Project.version)
+            .where(Project.id == project_id)
+        ).one())
+
+
+def test_project_counters_follow_task_writes(client):
+    headers = register(client)
+    project = create_project(client, headers)
+    other = create_project(client, headers, name="Other")
+    assert counters(project["id"])[:2] == (0, 0)
+
+    first = create_task(client, headers, project["id"])
+    second = create_task(client, headers, project["id"])
+    assert counters(project["id"])[:2] == (2, 0)
+
+    version = counters(project["id"])[2]
+    client.put(f"/api/tasks/{first['id']}/status/completed", headers=headers)
+    total, completed, new_version = counters(project["id"])
+    assert (total, completed) == (2, 1)
+    assert new_version > version
+
+    # Tasks only change project outside the API; the triggers cover that too
+    with engine.begin() as connection:
+        connection.execute(update(Task).where(Task.id == first["id"]).values(project_id=other["id"]))
+    assert counters(project["id"])[:2] == (1, 0)
+    assert counters(other["id"])[:2] == (1, 1)
+
+    client.delete(f"/api/tasks/{second['id']}", headers=headers)
+    assert counters(project["id"])[:2] == (0, 0)
+
+
+def test_bulk_writes_update_counters(client):
+    headers = register(client)
+    project = create_project(client, headers)
+    tasks = [
+        {"title": f"T{n}", "status": "todo", "priority": "low", "due_time": None, "estimated_hours": None}
+        for n in range(3)
+    ]
+    response = client.post(
+        "/api/tasks/bulk", headers=headers, json={"project_id": project["id"], "tasks": tasks}
+    )
+    ids = response.json()["ids"]
+    assert counters(project["id"])[:2] == (3, 0)
+
+    client.patch("/api/tasks/bulk", headers=headers, json={"ids": ids[:2], "status": "completed"})
+    assert counters(project["id"])[:2] == (3, 2)
+
+    client.post("/api/tasks/bulk/delete", headers=headers, json={"ids": ids[1:]})
+    assert counters(project["id"])[:2] == (1, 1)
+
+
+def role_version(user_id: int) -> int:
+    with engine.connect() as connection:
+        return connection.scalar(select(User.role_version).where(User.id == user_id))
+
+
+def test_role_changes_bump_role_version(client):
+    headers = register(client)
+    user_id = client.get("/api/users/me", headers=headers).json()["id"]
+    assert role_version(user_id) == 1
+
+    with engine.begin() as connection:
+        role_id = connection.execute(insert(Role).values(name="admin").returning(Role.id)).scalar_one()
+        connection.execute(insert(user_role).values(user_id=user_id, role_id=role_id))
+    assert role_version(user_id) == 2
+
+    with engine.begin() as connection:
+        connection.execute(update(Role).where(Role.id == role_id).values(name="owner"))
+    assert role_version(user_id) == 3
+
+    with engine.begin() as connection:
+        connection.execute(delete(user_role).where(user_role.c.user_id == user_id))
+    assert role_version(user_id) == 4